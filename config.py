@@ -14,24 +14,59 @@ init_energy_food = 100
 nb_ticks_day = 2
 pop_init = 100
 mutation_rate = 0.1
+# moteur de simulation : "object" (logic.game.Game) ou "vector" (logic.vector_engine.VectorGame)
+engine = "object"
+# exécution de la logique : "thread" (même processus que l'affichage) ou "process" (processus séparé)
+logic_mode = "thread"
+# nombre de jours que le processus de logique peut calculer en avance sur l'affichage
+days_ahead = 3
+# affichage : "full" (toute la carte dessinée puis mise à l'échelle par la caméra)
+# ou "viewport" (seule la partie visible, dessinée directement à la résolution de la fenêtre)
+render_mode = "full"
 
 #varaibles pour la musique
 music_path ="music/"
 
 assets_path = "assets/"
 
+# fichier de sauvegarde de la partie (menu Sauvegarder / Charger)
+save_file = "saves/partie.evo"
+# sauvegarde automatique tous les autosave_days jours (0 : désactivée, par défaut) dans autosave_path,
+# seules les autosave_keep plus récentes sont gardées (au moins 1)
+autosave_days = 0
+autosave_keep = 5
+autosave_path = "saves/auto/"
+# journal des événements (python -m logic.run --journal) : état complet tous les journal_keyframe_days jours
+# pour pouvoir rejouer à partir de n'importe quel jour
+journal_keyframe_days = 100
+
+# profilage (profiler.py) : actif dès le lancement, fichier d'export des percentiles,
+# jour dont tous les appels sont enregistrés par cProfile (0 : aucun)
+profiling = False
+profile_file = "profile.csv"
+cprofile_day = 0
+
 # Variables pour les sprites
 sprite_path = "sprites/"
+# sprites calculés au premier lancement (halos) et réutilisés ensuite
+cache_path = "cache/"
 tileset_x_offset, tileset_y_offset = 0, 0
 pos_x_tile, pos_y_tile = 2,2
 tile_size = 32
 
+# mémoire maximale (en Mo) des morceaux de sol gardés en cache
+ground_cache_size = 256
+
 # activation ou non du déplacement avec le curseur de la souris sur les bords de la fenètre
 move_with_mouse = False
 
 # zoom min et max cen nombre de cellule
 zoom_min = 4
 zoom_max = 40
+# en mode "viewport" seulement (la caméra peut alors dézoomer jusqu'à toute la carte), en dessous de
+# density_cell_pixels pixels de fenêtre par case la carte est affichée en densité (couleur par case)
+# plutôt qu'avec un sprite par entité
+density_cell_pixels = 8
 
 # taille sur les bords de l'écran pour le déplacement au curseur
 size_move_border = 50
@@ -49,6 +84,14 @@ class Config():
     bob_mass=1
     bob_memory=0
     bob_perception=0
+    mutation_rate = mutation_rate
+    engine = engine
+    logic_mode = logic_mode
+    days_ahead = days_ahead
+    render_mode = render_mode
+    autosave_days = autosave_days
+    profiling = profiling
+    cprofile_day = cprofile_day
 
     # Variables d'interface
     screen_size = [ np.ceil(tile_size*(N+M)/2 / i) for i in range(1,3)]
@@ -56,3 +99,47 @@ class Config():
     interface_x_offset = interface_y_offset
     screen_size[0] += 2*interface_x_offset
     screen_size[1] += 2*interface_y_offset
+
+
+def config_to_dict(config=Config) -> dict:
+    """ Retourne les valeurs de la configuration (classe Config ou instance) sous forme de dictionnaire,
+        par exemple pour la transmettre à un autre processus
+    """
+    return {name: getattr(config, name) for name in dir(config)
+            if not name.startswith("_") and not callable(getattr(config, name))}
+
+def load_config(values: dict, config=Config):
+    """ Applique les valeurs d'un dictionnaire à la configuration (classe Config ou instance)
+    """
+    for name, value in values.items():
+        setattr(config, name, value)
+
+def parse_value(name: str, text: str, config=Config):
+    """ Convertit le texte d'un paramètre dans le type de sa valeur actuelle dans la configuration,
+        un paramètre numérique accepte un entier ou un flottant (bob_mass = 1.5)
+    """
+    if not hasattr(config, name):
+        raise KeyError(f"paramètre inconnu : {name}")
+    current = getattr(config, name)
+    if isinstance(current, bool):
+        return text.strip().lower() in ("1", "yes", "true", "on")
+    if isinstance(current, (int, float)):
+        try: return int(text)
+        except ValueError: return float(text)
+    if isinstance(current, str):
+        return text.strip()
+    raise KeyError(f"paramètre non modifiable par texte : {name}")
+
+def load_config_file(path: str, config=Config):
+    """ Charge un fichier de configuration INI dont la section [Config] reprend les noms des attributs de Config,
+        chaque valeur est convertie par parse_value
+
+        [Config]
+        width_map = 200
+        P0 = 500
+    """
+    parser = ConfigParser()
+    parser.optionxform = str # conserve la casse des noms (P0)
+    if not parser.read(path):
+        raise FileNotFoundError(path)
+    load_config({name: parse_value(name, value, config) for name, value in parser["Config"].items()}, config)
@@ -1,16 +1,50 @@
+import math
 import pygame
 
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import *
 
-# python3 -m pip install shapely
-from shapely.geometry import Point
-from shapely.geometry.polygon import Polygon
-
 SPEED_MIN = 2
 SPEED_MAX = 8
 
+def rhombus_interval(x: float, y: float, dx: float, dy: float, center_x: float, center_y: float,
+                     half_width: float, half_height: float):
+    """ Intervalle ouvert des t pour lesquels le point (x + t*dx, y + t*dy) est strictement dans le losange
+    |X - center_x| / half_width + |Y - center_y| / half_height < 1, ou None s'il n'y passe jamais.
+    Le losange est l'intersection des quatre demi-plans ±X/half_width ±Y/half_height < 1 (centrés),
+    chacun linéaire en t : chaque côté borne t d'un seul côté
+    """
+    low, high = -math.inf, math.inf
+    for sign_x in (-1, 1):
+        for sign_y in (-1, 1):
+            start = sign_x * (x - center_x) / half_width + sign_y * (y - center_y) / half_height
+            slope = sign_x * dx / half_width + sign_y * dy / half_height
+            if slope > 0:
+                high = min(high, (1 - start) / slope)
+            elif slope < 0:
+                low = max(low, (1 - start) / slope)
+            elif start >= 1:
+                return None
+    return (low, high) if low < high else None
+
+def path_fraction(intervals: list, number_corner: int, furthest: bool):
+    """ Fraction t de [0, 1] d'un déplacement où au moins number_corner des intervalles (un par coin) contiennent t :
+    la borne haute de l'ensemble si furthest (le point est juste avant), sa borne basse sinon (juste après).
+    None si aucune fraction ne convient
+    """
+    bounds = [(max(low, 0), min(high, 1)) for low, high in filter(None, intervals)]
+    bounds = [(low, high) for low, high in bounds if low < high]
+    if furthest:
+        for t in sorted({high for _, high in bounds}, reverse=True):
+            if sum(low < t <= high for low, high in bounds) >= number_corner:
+                return t
+    else:
+        for t in sorted({low for low, _ in bounds}):
+            if sum(low <= t < high for low, high in bounds) >= number_corner:
+                return t
+    return None
+
 class CameraController:
 
     def __init__(self, main_surface: pygame.Surface):
@@ -52,13 +86,11 @@ class CameraController:
         self.position_camera_x = (self.main_surface.get_width() // 2) - (self.zoom_map_width // 2)
         self.position_camera_y = (self.main_surface.get_height() // 2) - (self.zoom_map_height // 2)
 
-        # forme de losange pour la vérification de sorti de map
-        self.mathematic_map = Polygon((
-            (self.main_surface.get_width() // 2, Config.interface_y_offset),
-            (self.main_surface.get_width() - Config.interface_x_offset, self.main_surface.get_height() // 2),
-            (self.main_surface.get_width() // 2, self.main_surface.get_height() - Config.interface_y_offset),
-            (Config.interface_x_offset, self.main_surface.get_height() // 2)
-        ))
+        # forme de losange pour la vérification de sorti de map : centre et demi-diagonales
+        self.map_center_x = self.main_surface.get_width() // 2
+        self.map_center_y = self.main_surface.get_height() // 2
+        self.map_half_width = self.map_center_x - Config.interface_x_offset
+        self.map_half_height = self.map_center_y - Config.interface_y_offset
          
 
     def get_viewpoint(self) -> pygame.Surface:
@@ -84,18 +116,45 @@ class CameraController:
             exit()
 
 
+    def get_view_rect(self) -> pygame.Rect:
+        """Obtenir la zone de la surface du jeu actuellement visible
+
+        Returns:
+            Rect: rectangle visible, en pixels de la surface du jeu
+        """
+        return pygame.Rect(self.position_camera_x, self.position_camera_y, self.zoom_map_width, self.zoom_map_height)
+
+
     def modify_speed(self) -> None:
         # mise à l'echelle linéaire en fonction du zoom
         self.speed = SPEED_MIN + ((self.zoom_map_width - zoom_min*tile_size) * (SPEED_MAX - SPEED_MIN)) // (zoom_max*tile_size + zoom_min*tile_size)
 
 
+    def max_zoom_width(self) -> int:
+        """Largeur maximale de la zone affichée (en pixels de la carte) : zoom_max cases, ou toute la carte
+        en mode "viewport", où une vue très dézoomée est dessinée en densité (ViewportRenderer)
+        """
+        if Config.render_mode == "viewport":
+            return self.main_surface.get_width()
+        return min(self.main_surface.get_width(), zoom_max*tile_size)
+
+
+    def zoom_step(self) -> int:
+        """Pas de zoom par défaut : 2 cases, ou un huitième de la zone affichée en mode "viewport"
+        pour traverser en quelques crans l'écart entre quelques cases et toute la carte
+        """
+        if Config.render_mode == "viewport":
+            return max(tile_size*2, self.zoom_map_width // 8)
+        return tile_size*2
+
+
     def get_zoom_ratio(self) -> int:
         """Obtenir la valeur actuel du zoom sur une échelle de 0 à 100
 
         Returns:
             int: taux de zoom entre 0 et 100
         """
-        return int((1 - (self.zoom_map_width - zoom_min*tile_size) / (min(self.main_surface.get_width(), zoom_max*tile_size) - zoom_min*tile_size)) * 100)
+        return int((1 - (self.zoom_map_width - zoom_min*tile_size) / (self.max_zoom_width() - zoom_min*tile_size)) * 100)
 
     
     def change_zoom_with_slider(self, ratio:float) -> None:
@@ -104,7 +163,7 @@ class CameraController:
         Args:
             ratio (float): taux entre 0 et 100
         """
-        new_zoom = int((min(self.main_surface.get_width(), zoom_max*tile_size) - zoom_min*tile_size) * (1-(ratio / 100)) + zoom_min*tile_size)
+        new_zoom = int((self.max_zoom_width() - zoom_min*tile_size) * (1-(ratio / 100)) + zoom_min*tile_size)
 
         if new_zoom < self.zoom_map_width:
             self.zoom_in(self.zoom_map_width - new_zoom)
@@ -129,12 +188,14 @@ class CameraController:
         self.zoom_map_height = zoom_map_height_next
 
 
-    def zoom_in(self, _zoom_step = tile_size*2):
+    def zoom_in(self, _zoom_step = None):
         """zoom vers l'avant de la caméra, de 2 cases. On ne peux pas zoomer sur plus petit que 4 cases de large
 
         Args:
-            _zoom_step (int, optional): pas du zoom. Defaults to tile_size*2.
+            _zoom_step (int, optional): pas du zoom. Defaults to zoom_step().
         """
+        if _zoom_step is None:
+            _zoom_step = self.zoom_step()
         # rétrecissement de la zone affichée
         zoom_map_width_next = self.zoom_map_width - _zoom_step
 
@@ -154,23 +215,26 @@ class CameraController:
             self.zoom_map_height = zoom_map_height_next
 
             self.modify_speed()
+            self._recenter_in_map()
 
 
-    def zoom_out(self, _zoom_step = tile_size*2):
+    def zoom_out(self, _zoom_step = None):
         """zoom vers l'arrière de la caméra, de 2 cases
 
         Args:
-            _zoom_step (int, optional): pas du dezoom. Defaults to tile_size*2.
+            _zoom_step (int, optional): pas du dezoom. Defaults to zoom_step().
         """
+        if _zoom_step is None:
+            _zoom_step = self.zoom_step()
         # si on est déjà au zoom max on ne fais rien
-        if self.zoom_map_width < min((tile_size * zoom_max), self.main_surface.get_width()):
+        if self.zoom_map_width < self.max_zoom_width():
             # le dezoom est un poil plus complex au niveau des vérifications
             zoom_map_width_next = self.zoom_map_width + _zoom_step
             zoom_map_height_next = int(zoom_map_width_next * self.aspect_ratio)
 
             # si zoom suivant plus grand que le zoom max
-            if zoom_map_width_next > min((tile_size * zoom_max), self.main_surface.get_width()):
-                zoom_map_width_next = min((tile_size * zoom_max), self.main_surface.get_width())
+            if zoom_map_width_next > self.max_zoom_width():
+                zoom_map_width_next = self.max_zoom_width()
                 zoom_map_height_next = int(zoom_map_width_next * self.aspect_ratio)
 
             position_camera_y_next = 0
@@ -208,6 +272,7 @@ class CameraController:
             self.zoom_map_height = zoom_map_height_next   
 
             self.modify_speed()     
+            self._recenter_in_map()
 
 
     def move_right(self):
@@ -218,11 +283,7 @@ class CameraController:
         if (position_camera_x_next + self.zoom_map_width) > self.main_surface.get_width():
             position_camera_x_next = self.main_surface.get_width() - self.zoom_map_width
 
-        if self._is_camera_in_map(
-            top_right_corner = (position_camera_x_next + self.zoom_map_width, self.position_camera_y), 
-            bottom_right_corner = (position_camera_x_next + self.zoom_map_width, self.position_camera_y + self.zoom_map_height)
-        ):
-            self.position_camera_x = position_camera_x_next
+        self.position_camera_x, self.position_camera_y = self._clamp_to_map(position_camera_x_next, self.position_camera_y)
 
 
     def move_left(self):
@@ -233,11 +294,7 @@ class CameraController:
         if position_camera_x_next < 0:
             position_camera_x_next = 0
 
-        if self._is_camera_in_map(
-            top_left_corner = (position_camera_x_next, self.position_camera_y),
-            bottom_left_corner = (position_camera_x_next, self.position_camera_y + self.zoom_map_height)
-        ):
-            self.position_camera_x = position_camera_x_next
+        self.position_camera_x, self.position_camera_y = self._clamp_to_map(position_camera_x_next, self.position_camera_y)
 
 
     def move_up(self):
@@ -248,11 +305,7 @@ class CameraController:
         if (position_camera_y_next < 0):
             position_camera_y_next = 0
 
-        if self._is_camera_in_map(
-            top_left_corner = (self.position_camera_x, position_camera_y_next),
-            top_right_corner = (self.position_camera_x + self.zoom_map_width, position_camera_y_next)
-        ):
-            self.position_camera_y = position_camera_y_next
+        self.position_camera_x, self.position_camera_y = self._clamp_to_map(self.position_camera_x, position_camera_y_next)
 
 
     def move_down(self):
@@ -263,11 +316,7 @@ class CameraController:
         if (position_camera_y_next + self.zoom_map_height) > self.main_surface.get_height():
             position_camera_y_next = self.main_surface.get_height() - self.zoom_map_height
 
-        if self._is_camera_in_map(
-            bottom_left_corner = (self.position_camera_x, position_camera_y_next + self.zoom_map_height),
-            bottom_right_corner = (self.position_camera_x + self.zoom_map_width, position_camera_y_next + self.zoom_map_height)
-        ):
-            self.position_camera_y = position_camera_y_next
+        self.position_camera_x, self.position_camera_y = self._clamp_to_map(self.position_camera_x, position_camera_y_next)
 
 
     def position_camera_to_game(self, x:int, y:int) -> (int, int):
@@ -283,33 +332,87 @@ class CameraController:
         return self.position_camera_x + x, self.position_camera_y + y
 
 
-    def _is_camera_in_map(self, number_corner = 2, /, top_left_corner = None, top_right_corner = None, bottom_right_corner = None, bottom_left_corner = None) -> bool:
-        """ Prédicat pour savoir si le nombre de coins de la caméra indiqués est sur la map du jeu
+    def _is_camera_in_map(self, x: int, y: int, number_corner = 2) -> bool:
+        """ Prédicat pour savoir si au moins number_corner coins de la caméra placée en (x, y) sont sur la map du jeu
 
         Args:
+            x (int): position en abscisse du coin supérieur gauche de la caméra
+            y (int): position en ordonnée du coin supérieur gauche de la caméra
             number_corner (int, optional): nombre de coins qui doivent être sur la map. Defaults to 2.
-            top_left_corner (tuple(int, int), optional): coin supérieur gauche de la caméra. Defaults to None.
-            top_right_corner (tuple(int, int), optional): coin supérieur droit de la caméra. Defaults to None.
-            bottom_right_corner (tuple(int, int), optional): coin inférieur droit de la caméra. Defaults to None.
-            bottom_left_corner (tuple(int, int), optional): coin inférieur gauche de la caméra. Defaults to None.
 
         Returns:
             bool: Vrai si le nombre de coin requis sont bien sur la map, Faux sinon
         """
         if (self.zoom_map_width < self.main_surface.get_width() // 2) and (Config.width_map > zoom_max):
-            # haut-gauche, haut-droite, bas-droite, bas-gauche
-            points = (
-                Point(top_left_corner if top_left_corner is not None else (self.position_camera_x, self.position_camera_y)),
-                Point(top_right_corner if top_right_corner is not None else (self.position_camera_x + self.zoom_map_width, self.position_camera_y)),
-                Point(bottom_right_corner if bottom_right_corner is not None else (self.position_camera_x + self.zoom_map_width, self.position_camera_y + self.zoom_map_height)),
-                Point(bottom_left_corner if bottom_left_corner is not None else (self.position_camera_x, self.position_camera_y + self.zoom_map_height))
-            )
-
-            return sum(1 for p in points if p.within(self.mathematic_map)) >= number_corner
+            # un point est strictement dans le losange si |dx| / demi-largeur + |dy| / demi-hauteur < 1
+            corners = 0
+            for corner_x in (x, x + self.zoom_map_width):
+                for corner_y in (y, y + self.zoom_map_height):
+                    if abs(corner_x - self.map_center_x) / self.map_half_width + abs(corner_y - self.map_center_y) / self.map_half_height < 1:
+                        corners += 1
+            return corners >= number_corner
         else:
             return True
 
 
+    def _path_fraction(self, x: int, y: int, dx: int, dy: int, furthest: bool, number_corner = 2):
+        """ Fraction du déplacement de la caméra de (x, y) vers (x + dx, y + dy) où elle sort de la map (furthest)
+        ou y revient, d'après les intervalles de chacun de ses coins dans le losange (voir path_fraction)
+        """
+        intervals = [rhombus_interval(corner_x, corner_y, dx, dy, self.map_center_x, self.map_center_y,
+                                      self.map_half_width, self.map_half_height)
+                     for corner_x in (x, x + self.zoom_map_width)
+                     for corner_y in (y, y + self.zoom_map_height)]
+        return path_fraction(intervals, number_corner, furthest)
+
+
+    def _clamp_to_map(self, position_camera_x_next: int, position_camera_y_next: int) -> (int, int):
+        """ Position valide la plus proche de celle demandée, sur le segment qui la relie à la position actuelle :
+        la caméra avance jusqu'au bord de la map au lieu de rester bloquée
+
+        Returns:
+            (int, int): nouvelle position du coin supérieur gauche de la caméra
+        """
+        if self._is_camera_in_map(position_camera_x_next, position_camera_y_next):
+            return position_camera_x_next, position_camera_y_next
+        dx = position_camera_x_next - self.position_camera_x
+        dy = position_camera_y_next - self.position_camera_y
+        t = self._path_fraction(self.position_camera_x, self.position_camera_y, dx, dy, furthest=True)
+        if t is not None:
+            # pas d'un pixel le plus loin, à un près selon l'arrondi du trajet et le bord exclu
+            steps = max(abs(dx), abs(dy))
+            for back in (0, 1, 2):
+                step = max(math.ceil(steps * t) - back, 0)
+                x = self.position_camera_x + round(dx * step / steps)
+                y = self.position_camera_y + round(dy * step / steps)
+                if self._is_camera_in_map(x, y):
+                    return x, y
+        return self.position_camera_x, self.position_camera_y
+
+
+    def _recenter_in_map(self):
+        """ Après un zoom, ramène la caméra vers le centre de la map juste assez pour qu'elle soit de nouveau dessus
+        """
+        if self._is_camera_in_map(self.position_camera_x, self.position_camera_y):
+            return
+        center_x = self.map_center_x - self.zoom_map_width // 2
+        center_y = self.map_center_y - self.zoom_map_height // 2
+        dx = center_x - self.position_camera_x
+        dy = center_y - self.position_camera_y
+        t = self._path_fraction(self.position_camera_x, self.position_camera_y, dx, dy, furthest=False)
+        if t is not None:
+            # premier pas d'un pixel sur la map, à un près selon l'arrondi du trajet et le bord exclu
+            steps = max(abs(dx), abs(dy))
+            for ahead in (0, 1, 2):
+                step = min(math.floor(steps * t) + ahead, steps)
+                x = self.position_camera_x + round(dx * step / steps)
+                y = self.position_camera_y + round(dy * step / steps)
+                if self._is_camera_in_map(x, y):
+                    self.position_camera_x, self.position_camera_y = x, y
+                    return
+        self.position_camera_x, self.position_camera_y = center_x, center_y
+
+
     def _debug(self):
         """Méthode pour afficher quelque information utils, pratique pour faire du debugage dans le terminal
         """
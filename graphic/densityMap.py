@@ -0,0 +1,105 @@
+import numpy as np
+import pygame
+import graphic.isometric as isometric
+
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+# largeur (en pixels) d'une case dans l'image de densité
+DENSITY_CELL_SIZE = 4
+# nombre de bobs sur une case à partir duquel sa couleur est la plus vive
+DENSITY_SATURATION = 4
+
+EMPTY_COLOR = (30, 50, 20)
+FOOD_COLOR = (60, 70, 190)
+LOW_ENERGY_COLOR = np.array((255, 0, 0))
+HIGH_ENERGY_COLOR = np.array((0, 255, 0))
+
+class DensityMap():
+    """
+        Carte de densité pour les vues très dézoomées : une couleur par case au lieu d'un sprite par entité.
+        Nombre de bobs (intensité), énergie moyenne (du rouge au vert, comme le halo) et nourriture (bleu)
+        sont agrégés par case une fois par jour, projetés dans une petite image isométrique (DENSITY_CELL_SIZE pixels
+        par case) au premier affichage du jour, puis seule la partie visible en est mise à l'échelle à chaque frame.
+    """
+    def __init__(self):
+        self._cells = None     # indice de case de chaque pixel de l'image (-1 hors de la carte), ne dépend que de la carte
+        self._colors = None    # couleur de chaque case, (largeur * hauteur, 3)
+        self.image = None      # image isométrique du jour, calculée au premier affichage
+
+    def update(self, snapshot):
+        """
+            Agrège les bobs et la nourriture du jour par case
+        """
+        nb_cells = Config.width_map * Config.height_map
+        bobs = snapshot.get_bobs_pos()
+        bobs_cells = bobs[:, 0] * Config.height_map + bobs[:, 1]
+        count = np.bincount(bobs_cells, minlength=nb_cells)
+        energy = np.bincount(bobs_cells, weights=snapshot.get_bobs_energy(), minlength=nb_cells)
+        foods = snapshot.get_foods_pos()
+        food = np.zeros(nb_cells, dtype=bool)
+        food[foods[:, 0] * Config.height_map + foods[:, 1]] = True
+
+        colors = np.empty((nb_cells, 3))
+        colors[:] = EMPTY_COLOR
+        colors[food] = FOOD_COLOR
+        has_bobs = count > 0
+        # tranche d'énergie moyenne ramenée entre 0 et 1
+        mean_energy = energy[has_bobs] / count[has_bobs] / 4
+        intensity = 0.6 + 0.4 * np.minimum(count[has_bobs] / DENSITY_SATURATION, 1)
+        colors[has_bobs] = ((1 - mean_energy)[:, None] * LOW_ENERGY_COLOR + mean_energy[:, None] * HIGH_ENERGY_COLOR) * intensity[:, None]
+        self._colors = colors.astype(np.uint8)
+        self.image = None
+
+    def scale(self) -> float:
+        """
+            Pixels de l'image de densité par pixel de la carte (celle de Interface)
+        """
+        return DENSITY_CELL_SIZE / tile_size
+
+    def cells_of_pixels(self) -> np.ndarray:
+        """
+            Case (indice x * hauteur + y, -1 hors de la carte) sous le centre de chaque pixel de l'image de densité
+        """
+        k = self.scale()
+        width = int(np.ceil((Config.width_map + Config.height_map) * tile_size / 2 * k))
+        height = int(np.ceil((Config.width_map + Config.height_map) * tile_size / 4 * k))
+        u, v = np.meshgrid(np.arange(width) + 0.5, np.arange(height) + 0.5, indexing="ij")
+        pixels = np.stack([u.ravel(), v.ravel()], axis=1) / k + (Config.interface_x_offset, Config.interface_y_offset)
+        carts = np.floor(isometric.iso_to_cart(isometric.print_to_iso(pixels))).astype(int)
+        inside = (carts[:, 0] >= 0) & (carts[:, 0] < Config.width_map) & (carts[:, 1] >= 0) & (carts[:, 1] < Config.height_map)
+        cells = np.where(inside, carts[:, 0] * Config.height_map + carts[:, 1], -1).astype(np.int32)
+        return cells.reshape(width, height)
+
+    def render_image(self):
+        if self._cells is None:
+            self._cells = self.cells_of_pixels()
+        pixels = np.zeros(self._cells.shape + (3,), dtype=np.uint8)
+        inside = self._cells >= 0
+        pixels[inside] = self._colors[self._cells[inside]]
+        self.image = pygame.surfarray.make_surface(pixels)
+
+    def draw(self, target: pygame.Surface, view: pygame.Rect):
+        """
+            Dessine la zone view (en pixels de la carte) sur toute la surface target
+        """
+        if self._colors is None:
+            target.fill("black")
+            return
+        if self.image is None:
+            self.render_image()
+        k = self.scale()
+        scale = target.get_width() / view.width
+        source = pygame.Rect(np.floor((view.x - Config.interface_x_offset) * k), np.floor((view.y - Config.interface_y_offset) * k),
+                             np.ceil(view.width * k) + 1, np.ceil(view.height * k) + 1)
+        part = source.clip(self.image.get_rect())
+        target.fill("black")
+        if not part.width or not part.height:
+            return
+        # position et taille de la partie visible dans la fenêtre
+        left = round(((part.x / k + Config.interface_x_offset) - view.x) * scale)
+        top = round(((part.y / k + Config.interface_y_offset) - view.y) * scale)
+        right = round(((part.right / k + Config.interface_x_offset) - view.x) * scale)
+        bottom = round(((part.bottom / k + Config.interface_y_offset) - view.y) * scale)
+        target.blit(pygame.transform.scale(self.image.subsurface(part), (right - left, bottom - top)), (left, top))
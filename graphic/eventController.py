@@ -86,6 +86,9 @@ class EventController:
                 if event.type == pygame.QUIT:
                     self.quit()
 
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.menu.toggle_profiler()
+
                 if event.type == pygame.USEREVENT+1:
                     self.camera.change_zoom_with_slider(self.menu.zoom_slider.get_value())
                 
@@ -0,0 +1,220 @@
+import hashlib
+import numpy as np
+import pygame
+import graphic.isometric as isometric
+from graphic.spriteAtlas import SpriteAtlas
+
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+# couleur du halo selon l'énergie du bob
+HALO_COLORS = {
+    "100%": (0,255,0),
+    "80%": (55,200,0),
+    "60%": (128,127,0),
+    "40%": (200,50,0),
+    "20%": (255,0,0),
+}
+# à incrémenter si le calcul des halos change, pour ne pas relire d'anciens fichiers
+HALO_VERSION = 1
+
+class GameRenderer():
+    """
+        Base commune des affichages du jeu : chargement des sprites, placement des entités sur les cases
+        et animation des bobs au cours d'un jour. Ne dessine rien elle-même.
+    """
+    def init_renderer(self):
+        self.font = pygame.font.SysFont('chalkduster.ttf', 40)
+        self._images = {}
+        self.load_images()
+        # trajectoires des bobs du jour à l'écran : position de blit d'arrivée, déplacement et sprite (halo) de chacun
+        self._bobs_screen_end = np.empty((0, 2))
+        self._bobs_screen_move = np.empty((0, 2))
+        self._bobs_images = []
+
+    # --- Chargement des sprites ---
+    def load_images(self):
+        """
+            Charge les images nécessaires au jeu
+        """
+        self.tileset = self.load_image('Tileset.png')
+        self.grass_tile = self.cut_in_image('Tileset.png', (pos_x_tile,pos_y_tile), (tileset_x_offset, tileset_y_offset))
+
+        self.bob = self.load_sprite('bob.png')
+        self.bob_with_border = self.load_sprite_with_halo('bob.png', 10)
+        self.apple = self.load_sprite('food.png')
+        self.apple = pygame.transform.scale_by(self.apple, 0.5)
+
+        # tous les sprites dans un atlas : ceux utilisés pour dessiner en sont des sous-surfaces
+        self.atlas = SpriteAtlas({"grass": self.grass_tile, "bob": self.bob, "apple": self.apple,
+                                  **{f"bob_{name}": halo for name, halo in self.bob_with_border.items()}})
+        sprites = self.atlas.sprites()
+        self.grass_tile, self.bob, self.apple = sprites["grass"], sprites["bob"], sprites["apple"]
+        self.bob_with_border = {name: sprites[f"bob_{name}"] for name in self.bob_with_border}
+    
+    def scale_sprite(self, image: pygame.image) -> pygame.image:
+        return pygame.transform.scale(image, (tile_size, int(tile_size * image.get_height() / image.get_width() )))
+
+    def load_sprite(self, path: str) -> pygame.image:
+        img = self.load_image(path)
+        img = self.scale_sprite(img)
+        return img
+
+    def load_image(self, image_path: str) -> pygame.image:
+        if image_path in self._images:
+            return self._images[image_path]
+        try:
+            image = pygame.image.load(f"{sprite_path}{image_path}").convert_alpha()
+            self._images[image_path] = image
+            return image
+        except pygame.error as e:
+            print(f"Impossible de charger l'image '{image_path}': {e}")
+            return None
+
+    def cut_in_image(self, image_path: str, pos: tuple, offset: tuple) -> pygame.Surface:
+        # Retourne l'image à la i ème ligne, j ème colonne  -> pos = (i, j)
+        return self._images[image_path].subsurface(
+                [
+                    pos[0]*tile_size + offset[0], 
+                    pos[1]*tile_size + offset[1], 
+                    tile_size,
+                    tile_size
+                ]
+            )
+
+    # --- Placement des sprites ---
+    
+    def place_top_position(self, image: pygame.image, pos: tuple) -> tuple:
+        pos[0] -= image.get_width()//2
+        return pos
+
+    def place_bottom_position(self, image: pygame.image, pos: tuple) -> tuple:
+        pos = self.place_top_position(image, pos)
+        pos[1] += tile_size/4 - image.get_height()
+        return pos
+
+    def get_middle_of_tile(self, pos: tuple) -> tuple:
+        # Retourne le milieu de la face supérieur, pas le milieu géométrique de l'image !
+        pos += tile_size/2, tile_size/4
+        return pos
+    
+    def entity_position(self, sprite: pygame.sprite, pos: tuple) -> tuple:
+        """
+            Position (en pixels entiers) où blitter une entité pour que son bas repose sur le milieu de la case pos
+        """
+        pos_iso = isometric.cart_to_iso(pos)
+        foot_pos = isometric.iso_to_print(self.place_bottom_position(sprite, pos_iso))
+        return int(foot_pos[0]), int(foot_pos[1])
+
+    def entity_positions(self, sprite: pygame.sprite, carts, exact=False) -> np.ndarray:
+        """
+            entity_position pour un tableau de cases (n, 2), projetées toutes à la fois.
+            Avec exact, les positions ne sont pas arrondies au pixel
+        """
+        pos_iso = isometric.cart_to_iso(np.asarray(carts, dtype=float).reshape(-1, 2))
+        pos_iso += (-(sprite.get_width()//2), tile_size/4 - sprite.get_height())
+        pos = isometric.iso_to_print(pos_iso)
+        return pos if exact else pos.astype(int)
+
+    def bob_position(self, end_coord, last_move, current_tick) -> tuple:
+        # Calcul de l'incrément de déplacement sur le prochain tick
+        new_x_tick = last_move[0] * (1- current_tick/ max_framerate)
+        new_y_tick = last_move[1] * (1- current_tick/ max_framerate)
+        return (end_coord[0] - new_x_tick, end_coord[1] - new_y_tick)
+
+    def bobs_screen_positions(self, current_tick) -> np.ndarray:
+        """
+            Position de blit de tous les bobs du jour pour la frame current_tick : une interpolation linéaire
+            sur les trajectoires calculées par init_values_bobs_day
+        """
+        return (self._bobs_screen_end - self._bobs_screen_move * (1- current_tick/ max_framerate)).astype(int)
+
+    def in_cells(self, x, y, cells: tuple):
+        """
+            Vrai si la case (x, y) est dans la plage cells, fonctionne aussi sur des tableaux numpy
+        """
+        x_min, x_max, y_min, y_max = cells
+        return (x_min <= x) & (x <= x_max) & (y_min <= y) & (y <= y_max)
+
+    # --- Gestion du liseré ---
+    
+    def calc_border_sprite(self, image: pygame.image, border_thickness) -> np.ndarray:
+        """
+            Masque (largeur, hauteur) des pixels transparents qui ont un pixel non transparent
+            à moins de border_thickness pixels (voisinage carré)
+        """
+        filled = pygame.surfarray.array3d(image).any(axis=2) | (pygame.surfarray.array_alpha(image) != 0)
+        width, height = filled.shape
+        padded = np.pad(filled, border_thickness)
+        # dilatation par un carré de côté 2 * border_thickness + 1 : sur les lignes puis sur les colonnes
+        rows = np.zeros((width, padded.shape[1]), dtype=bool)
+        for d in range(2 * border_thickness + 1):
+            rows |= padded[d:d + width, :]
+        dilated = np.zeros((width, height), dtype=bool)
+        for d in range(2 * border_thickness + 1):
+            dilated |= rows[:, d:d + height]
+        return dilated & ~filled
+    
+    def apply_border(self, image: pygame.image, color: tuple, border: np.ndarray) -> pygame.image :
+        """
+        Applique un liserai de couleur à une image, sur les pixels du masque border
+        """
+        image_copy = image.copy()
+        pixels = pygame.surfarray.pixels3d(image_copy)
+        pixels[border] = color
+        alpha = pygame.surfarray.pixels_alpha(image_copy)
+        alpha[border] = 255
+        del pixels, alpha # libère le verrou sur la surface
+        return image_copy
+
+    def choose_bob_border_bucket(self, bucket: int) -> pygame.image:
+        """ Halo correspondant à une tranche d'énergie de logic.snapshot (0 : <=20%, ..., 4 : >80%)
+        """
+        return self.bob_with_border[("20%", "40%", "60%", "80%", "100%")[bucket]]
+
+    def choose_bob_border(self, bob) -> pygame.image:
+        health_ratio = bob.get_E() / bob.get_Emax() * 100
+        if health_ratio <= 20: return self.bob_with_border["20%"]
+        elif health_ratio <= 40: return self.bob_with_border["40%"]
+        elif health_ratio <= 60: return self.bob_with_border["60%"]
+        elif health_ratio <= 80: return self.bob_with_border["80%"]
+        else: return self.bob_with_border["100%"] 
+    
+    def load_sprite_with_halo(self, path: str, border_thickness):
+        """
+            Sprite path entouré d'un halo de chaque couleur d'énergie. Les halos sont enregistrés dans cache_path,
+            identifiés par le contenu du fichier, l'épaisseur et la taille des tuiles : ils ne sont calculés
+            qu'au premier lancement
+        """
+        image = self.load_sprite(path)
+        with open(f"{sprite_path}{path}", "rb") as f:
+            key = hashlib.sha256(f.read()).hexdigest()[:16]
+        files = {name: f"{cache_path}halo_v{HALO_VERSION}_{key}_{border_thickness}_{tile_size}_{name[:-1]}.png" for name in HALO_COLORS}
+        if all(os.path.exists(file) for file in files.values()):
+            try:
+                return {name: pygame.image.load(file).convert_alpha() for name, file in files.items()}
+            except pygame.error:
+                pass # fichier abîmé : les halos sont recalculés
+
+        border = self.calc_border_sprite(image, border_thickness)
+        halos = {name: self.apply_border(image, color, border) for name, color in HALO_COLORS.items()}
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            for name, file in files.items():
+                # écrit à côté puis renommé : un lancement interrompu ne laisse pas de fichier tronqué
+                pygame.image.save(halos[name], file[:-4] + ".tmp.png")
+                os.replace(file[:-4] + ".tmp.png", file)
+        except (OSError, pygame.error) as e:
+            print(f"Impossible d'enregistrer les halos dans '{cache_path}': {e}")
+        return halos
+
+    # --- Jour ---
+
+    def init_values_bobs_day(self, snapshot):
+        # la projection étant affine, interpoler à l'écran revient à interpoler sur les cases (bob_position) :
+        # les trajectoires sont projetées une seule fois pour tout le jour.
+        # Les halos ont tous la taille du sprite bob
+        self._bobs_screen_end = self.entity_positions(self.bob, snapshot.get_bobs_pos(), exact=True)
+        self._bobs_screen_move = snapshot.get_bobs_last_move() @ isometric.transfer_cart_to_iso.T
+        self._bobs_images = [self.choose_bob_border_bucket(bucket) for bucket in snapshot.get_bobs_energy().tolist()]
@@ -5,12 +5,19 @@ from pygame_menu import sound
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import *
+from logic.autosave import latest_autosave
+from profiler import PROFILER
+from graphic.profilerOverlay import ProfilerOverlay
 
 class GameMenu(pygame.Surface):
 
     def __init__(self, surface):
         super().__init__(pygame.display.get_surface().get_size())
         self.game_is_on = False
+        # demandes du menu traitées par la boucle principale (main.py) entre deux jours
+        self.load_path = None # sauvegarde à reprendre au lieu d'une nouvelle partie
+        self.save_requested = False
+        self.profiler_overlay = ProfilerOverlay()
         self.zoom_slider_event = pygame.event.Event(pygame.USEREVENT+1,message= 'zoommustchange')
         self.volume_change_event = pygame.event.Event(pygame.USEREVENT+2,message= 'volumemustchange')
         self.surface = surface
@@ -41,6 +48,10 @@ class GameMenu(pygame.Surface):
         self.main_menu.add.vertical_margin(50)
         self.main_menu.add.button('Nouvelle partie', self.new_game,align=pygame_menu.locals.ALIGN_CENTER)
         self.main_menu.add.vertical_margin(10)
+        self.main_menu.add.button('Charger la partie', self.load_saved_game,align=pygame_menu.locals.ALIGN_CENTER)
+        self.main_menu.add.vertical_margin(10)
+        self.main_menu.add.button('Reprendre la sauvegarde auto', self.resume_autosave,align=pygame_menu.locals.ALIGN_CENTER)
+        self.main_menu.add.vertical_margin(10)
         self.main_menu.add.button('Quitter', pygame.QUIT,align=pygame_menu.locals.ALIGN_CENTER)
         self.main_menu.draw(self.surface)
 
@@ -58,6 +69,14 @@ class GameMenu(pygame.Surface):
         self.tickdisplay = self.game_screen.add.label('tick : 0')
         self.tickdisplay.translate(-20,0)
         self.game_screen.add.vertical_margin(25)
+        self.savebutton = self.game_screen.add.button('Sauvegarder', self.request_save,background_color=(200,200,200,25))
+        self.savebutton.translate(-20,0 )
+        self.savebutton.set_controls(keyboard=False)
+        self.game_screen.add.vertical_margin(25)
+        self.profilerbutton = self.game_screen.add.button('Profilage', self.toggle_profiler,background_color=(200,200,200,25))
+        self.profilerbutton.translate(-20,0 )
+        self.profilerbutton.set_controls(keyboard=False)
+        self.game_screen.add.vertical_margin(25)
         self.quitbutton = self.game_screen.add.button('Quitter', pygame_menu.events.EXIT,background_color=(200,200,200,25))
         self.quitbutton.translate(-20,0 )
         self.quitbutton.set_controls(keyboard=False)
@@ -105,11 +124,53 @@ class GameMenu(pygame.Surface):
         Config.energy_food = data['energy_to_mate']
         Config.bob_speed = data['movement_bob']
         Config.move_with_cursor = data['move_with_mouse']
-        # Variables d'interface
+        self.set_screen_size()
+
+    def set_screen_size(self) -> None:
+        """
+        Taille de la carte affichée, d'après les dimensions de Config
+        """
         Config.screen_size = [ np.ceil(tile_size*(Config.width_map+Config.height_map)/2 / i) for i in range(1,3)]
         Config.screen_size[0] += 2*Config.interface_x_offset
         Config.screen_size[1] += 2*Config.interface_y_offset
 
+    def load_saved_game(self) -> None:
+        """
+        Lance la partie sauvegardée (save_file) au lieu d'une nouvelle partie
+        """
+        if not os.path.exists(save_file):
+            return
+        self.load_path = save_file
+        self.game_is_on = True
+
+    def resume_autosave(self) -> None:
+        """
+        Lance la plus récente des sauvegardes automatiques
+        """
+        if (path := latest_autosave()) is None:
+            return
+        self.load_path = path
+        self.game_is_on = True
+
+    def request_save(self) -> None:
+        """
+        Sauvegarde la partie à la fin du jour en cours
+        """
+        self.save_requested = True
+
+    def toggle_profiler(self) -> None:
+        """
+        Active ou désactive le profilage et son affichage (F3) ; à la désactivation, les percentiles sont exportés dans profile_file
+        """
+        PROFILER.toggle(profile_file)
+
+    def draw_profiler(self, surface) -> None:
+        """
+        Affiche les percentiles par-dessus le jeu quand le profilage est actif
+        """
+        if PROFILER.enabled:
+            self.profiler_overlay.draw(surface)
+
     def change_game_is_on(self):
         self.data_fun()
         if self.main_menu.get_current() == self.game_screen:
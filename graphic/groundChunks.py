@@ -0,0 +1,89 @@
+import numpy as np
+import pygame
+import graphic.isometric as isometric
+from collections import OrderedDict
+
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+# côté (en pixels, à l'échelle d'affichage) d'un morceau de sol
+CHUNK_SIZE = 256
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+class GroundChunks():
+    """
+        Sol de la carte découpé en morceaux carrés de CHUNK_SIZE pixels, dessinés à leur première utilisation
+        et gardés dans un cache LRU dont la mémoire est bornée par max_bytes.
+        Chaque échelle d'affichage a ses propres morceaux et sa tuile de sol mise à l'échelle, gardés dans le même
+        cache : à l'échelle scale, le pixel (X, Y) d'un morceau correspond au pixel (X / scale, Y / scale) de la carte
+        (celui de Interface). Les échelles doivent être des niveaux de zoom (isometric.snap_scale) pour que le cache serve
+    """
+    def __init__(self, tile: pygame.Surface, max_bytes=ground_cache_size * 2**20):
+        self.tile = tile
+        self.max_bytes = max_bytes
+        # ("chunk", échelle, i, j) -> morceau et ("tile", échelle) -> tuile à cette échelle,
+        # du moins au plus récemment utilisé
+        self._cache = OrderedDict()
+        self._bytes = 0
+
+    def cached(self, key: tuple, render) -> pygame.Surface:
+        """
+            Surface du cache pour key, calculée par render() si elle n'y est pas ; les plus anciennes sont retirées
+            au-delà de max_bytes, sauf celle qui vient d'être demandée même si elle dépasse à elle seule la limite
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        surface = render()
+        self._cache[key] = surface
+        self._bytes += surface_bytes(surface)
+        while self._bytes > self.max_bytes and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self._bytes -= surface_bytes(old)
+        return surface
+
+    def scaled_tile(self, scale: float) -> pygame.Surface:
+        if scale == 1:
+            return self.tile
+        # arrondi au pixel supérieur pour ne pas laisser de joint entre les tuiles
+        return self.cached(("tile", scale), lambda: pygame.transform.scale(
+            self.tile, (int(np.ceil(self.tile.get_width() * scale)), int(np.ceil(self.tile.get_height() * scale)))))
+
+    def chunk(self, i: int, j: int, scale=1) -> pygame.Surface:
+        return self.cached(("chunk", scale, i, j), lambda: self.render_chunk(i, j, scale))
+
+    def render_chunk(self, i: int, j: int, scale: float) -> pygame.Surface:
+        """
+            Dessine les tuiles de sol qui recouvrent le morceau (i, j), dans le même ordre que sur toute la carte (x puis y)
+        """
+        surface = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE))
+        tile = self.scaled_tile(scale)
+        area = pygame.Rect(i * CHUNK_SIZE / scale, j * CHUNK_SIZE / scale, CHUNK_SIZE / scale + 1, CHUNK_SIZE / scale + 1)
+        x_min, x_max, y_min, y_max = isometric.rect_to_cells(area.inflate(2 * tile_size, 2 * tile_size))
+        x_min, y_min = max(x_min, 0), max(y_min, 0)
+        x_max, y_max = min(x_max, Config.width_map - 1), min(y_max, Config.height_map - 1)
+        if x_min > x_max or y_min > y_max:
+            return surface
+        xs, ys = np.meshgrid(np.arange(x_min, x_max + 1), np.arange(y_min, y_max + 1), indexing="ij")
+        carts = np.stack([xs.ravel(), ys.ravel()], axis=1)
+        # position de Interface.place_tile, pour toutes les cases à la fois
+        tops = isometric.iso_to_print(isometric.cart_to_iso(carts)) - (self.tile.get_width() // 2, 0)
+        positions = np.floor(tops * scale + 0.5).astype(int) - (i * CHUNK_SIZE, j * CHUNK_SIZE)
+        visible = ((positions > -np.array(tile.get_size())) & (positions < CHUNK_SIZE)).all(axis=1)
+        surface.blits([(tile, pos) for pos in positions[visible].tolist()], False)
+        return surface
+
+    def draw(self, target: pygame.Surface, area: pygame.Rect, dest=(0, 0), scale=1):
+        """
+            Dessine la zone area du sol (en pixels à l'échelle scale) sur target, son coin supérieur gauche en dest
+        """
+        for i in range(area.left // CHUNK_SIZE, (area.right - 1) // CHUNK_SIZE + 1):
+            for j in range(area.top // CHUNK_SIZE, (area.bottom - 1) // CHUNK_SIZE + 1):
+                chunk_rect = pygame.Rect(i * CHUNK_SIZE, j * CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+                part = chunk_rect.clip(area)
+                target.blit(self.chunk(i, j, scale),
+                            (dest[0] + part.x - area.x, dest[1] + part.y - area.y),
+                            part.move(-chunk_rect.x, -chunk_rect.y))
@@ -1,5 +1,8 @@
+import numpy as np
 import pygame
 import graphic.isometric as isometric
+from graphic.gameRenderer import GameRenderer
+from graphic.groundChunks import GroundChunks
 
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -7,7 +10,10 @@ from config import *
 import logic.bob
 import logic.food
 
-class Interface(pygame.Surface):
+# taille (en pixels) des tuiles de rafraîchissement partiel : seules les tuiles modifiées sont redessinées
+DIRTY_TILE_SIZE = 64
+
+class Interface(pygame.Surface, GameRenderer):
     """
         Interface est une surface contenant l'ensemble des éléments graphiques (l'ensemble des sprites) qui 
         concerne l'affichage du jeu.
@@ -15,94 +21,38 @@ class Interface(pygame.Surface):
     """
     def __init__(self, size, flags=0):
         super().__init__(size, flags)
-        self.font = pygame.font.SysFont('chalkduster.ttf', 40)
-        self._images = {}
-        self.ground = pygame.Surface(size)
-        self.load_images()
-        self.bob_border_thinkness = 1
-        self.bob_image_border = self.calc_border_sprite(self.bob,self.bob_border_thinkness)
-        
-        self.generate_ground(self.grass_tile)
-
-    # --- Chargement des sprites ---
-    def load_images(self):
-        """
-            Charge les images nécessaires au jeu
-        """
-        self.tileset = self.load_image('Tileset.png')
-        self.grass_tile = self.cut_in_image('Tileset.png', (pos_x_tile,pos_y_tile), (tileset_x_offset, tileset_y_offset))
+        self.init_renderer()
+        # le sol n'est dessiné que morceau par morceau, à son premier affichage
+        self.ground = GroundChunks(self.grass_tile)
 
-        self.bob = self.load_sprite('bob.png')
-        self.bob_with_border = self.load_sprite_with_halo(self.bob, 10)
-        self.apple = self.load_sprite('food.png')
-        self.apple = pygame.transform.scale_by(self.apple, 0.5)
-    
-    def scale_sprite(self, image: pygame.image) -> pygame.image:
-        return pygame.transform.scale(image, (tile_size, int(tile_size * image.get_height() / image.get_width() )))
-
-    def load_sprite(self, path: str) -> pygame.image:
-        img = self.load_image(path)
-        img = self.scale_sprite(img)
-        return img
-
-    def load_image(self, image_path: str) -> pygame.image:
-        if image_path in self._images:
-            return self._images[image_path]
-        try:
-            image = pygame.image.load(f"{sprite_path}{image_path}").convert_alpha()
-            self._images[image_path] = image
-            return image
-        except pygame.error as e:
-            print(f"Impossible de charger l'image '{image_path}': {e}")
-            return None
-
-    def cut_in_image(self, image_path: str, pos: tuple, offset: tuple) -> pygame.Surface:
-        # Retourne l'image à la i ème ligne, j ème colonne  -> pos = (i, j)
-        return self._images[image_path].subsurface(
-                [
-                    pos[0]*tile_size + offset[0], 
-                    pos[1]*tile_size + offset[1], 
-                    tile_size,
-                    tile_size
-                ]
-            )
+        # rafraîchissement partiel : tuiles à redessiner et entités dessinées à la frame précédente
+        self._full_redraw = True
+        self._dirty_tiles = set()
+        self._view_tiles = set()  # tuiles visibles à la frame précédente, les autres ne sont pas tenues à jour
+        self._bobs_drawn = (np.empty((0, 2), dtype=int), np.empty(0, dtype=bool)) # positions et visibilité des bobs dessinés
+        self._foods = []          # (sprite, position de blit, rect) de chaque nourriture du jour
+        self._foods_by_tile = {}  # tuile -> nourritures qui la recouvrent
 
     # --- Placement des sprites ---
-    
-    def place_top_position(self, image: pygame.image, pos: tuple) -> tuple:
-        pos[0] -= image.get_width()//2
-        return pos
-
-    def place_bottom_position(self, image: pygame.image, pos: tuple) -> tuple:
-        pos = self.place_top_position(image, pos)
-        pos[1] += tile_size/4 - image.get_height()
-        return pos
-
-    def get_middle_of_tile(self, pos: tuple) -> tuple:
-        # Retourne le milieu de la face supérieur, pas le milieu géométrique de l'image !
-        pos += tile_size/2, tile_size/4
-        return pos
-    
+
     def place_entity(self, sprite: pygame.sprite, pos: tuple):
         """
             Place une entité à partir des coordonnées cartésiens sur la case adéquat.
             Place le bas sur le milieu de la tile.
         """
-        pos_iso = isometric.cart_to_iso(pos)
-        foot_pos = self.place_bottom_position(sprite, pos_iso)
-        self.blit(sprite, isometric.iso_to_print(foot_pos))
+        self.blit(sprite, self.entity_position(sprite, pos))
     
-    def place_tile(self, tile: pygame.image, pos: tuple):
-        pos_iso = isometric.cart_to_iso(pos)
-        self.ground.blit(tile, self.place_top_position(tile, isometric.iso_to_print(pos_iso)))
-    
-    def print_ground(self):
-        self.blit(self.ground, (0,0))
+    def print_ground(self, area=None):
+        if area is None: area = self.get_rect()
+        self.ground.draw(self, area, area.topleft)
 
-    def print_food(self, grid):
-        for key, foods in grid.get_all_foods().items():
-            for food in foods:
-                self.place_entity(self.apple, key)
+    def print_food(self, snapshot, cells=None):
+        foods = snapshot.get_foods_pos()
+        if cells is not None:
+            foods = foods[self.in_cells(foods[:, 0], foods[:, 1], cells)]
+        # toutes les nourritures projetées en une fois, puis dessinées en un seul appel
+        positions = self.entity_positions(self.apple, foods).tolist()
+        self.blits([(self.apple, pos) for pos in positions], False)
     """
     def print_bobs(self):
         for bob_info in self._bobs_infos:
@@ -119,27 +69,33 @@ class Interface(pygame.Surface):
             self.place_entity(bob_info["image"], (bob_info["start_coords"][0], bob_info["start_coords"][1]))
     """
     
-    def move_bob(self, end_coord, last_move, bob_sprite, current_tick):
-        # Calcul de l'incrément de déplacement sur le prochain tick
-        new_x_tick = last_move[0] * (1- current_tick/ max_framerate)
-        new_y_tick = last_move[1] * (1- current_tick/ max_framerate)
-        new_pos = (end_coord[0] - new_x_tick, end_coord[1] - new_y_tick)
-        self.place_entity(bob_sprite, new_pos) 
+    def bobs_frame(self, current_tick, area=None) -> tuple:
+        """
+            Positions de blit (n, 2) de tous les bobs pour la frame current_tick
+            et masque de ceux qui recouvrent la zone area
+        """
+        positions = self.bobs_screen_positions(current_tick)
+        width, height = self.bob.get_size()
+        if area is None: visible = np.ones(len(positions), dtype=bool)
+        else: visible = ((positions[:, 0] < area.right) & (positions[:, 0] + width > area.left) &
+                         (positions[:, 1] < area.bottom) & (positions[:, 1] + height > area.top))
+        return positions, visible
+
+    def visible_bobs(self, positions: np.ndarray, visible: np.ndarray) -> list:
+        """
+            (sprite, position de blit) des bobs visibles
+        """
+        return [(self._bobs_images[i], pos) for i, pos in zip(np.flatnonzero(visible).tolist(), positions[visible].tolist())]
     
-    def move_bobs(self, current_tick):
-        for bob_info in self._bobs_infos:
-            self.move_bob(bob_info["end_coords"], bob_info["last_move"], bob_info["image"], current_tick)
+    def move_bobs(self, current_tick, area=None):
+        positions, visible = self.bobs_frame(current_tick, area)
+        self.blits(self.visible_bobs(positions, visible), False)
+        self._bobs_drawn = (positions, visible)
 
        
     
     # --- Génération ---
     
-    def generate_ground(self, tile: pygame.image):
-        for i in range(Config.width_map):
-            for j in range(Config.height_map):
-                self.place_tile(tile, (i,j))
-        self.print_ground()
-        
     def bob_tick_unit(self, bob):
         x_tick = round(bob.last_move[0] * 1/ max_framerate, 3) + 0.001
         y_tick = round(bob.last_move[1] * 1/ max_framerate, 3) + 0.001
@@ -164,61 +120,113 @@ class Interface(pygame.Surface):
             
     """
 
-    def render_game(self, grid, current_tick):
-        self.print_ground()
-        self.print_food(grid)
-        self.move_bobs(current_tick)
+    def render_game(self, snapshot, current_tick, view=None):
+        """
+            Dessine la frame current_tick. Seule la zone view (rectangle visible de la caméra, toute la surface
+            par défaut) est tenue à jour : les entités hors de cette zone ne sont pas dessinées
+        """
+        if view is None: view = self.get_rect()
+        view_tiles = set(self.rect_tiles(view.clip(self.get_rect())))
+        area = self.tiles_area(view_tiles)
+        cells = self.area_cells(area)
+        if self._full_redraw:
+            self.print_ground(area)
+            self.print_food(snapshot, cells)
+            self.move_bobs(current_tick, area)
+            self._full_redraw = False
+            self._dirty_tiles.clear()
+        else:
+            # les tuiles qui entrent dans la vue n'ont pas été tenues à jour
+            self._dirty_tiles |= view_tiles - self._view_tiles
+            positions, visible = self.bobs_frame(current_tick, area)
+            old_positions, old_visible = self._bobs_drawn
+            # un bob qui a bougé salit son ancienne et sa nouvelle place
+            moved = (positions != old_positions).any(axis=1) | (visible != old_visible)
+            self.mark_bobs_dirty(old_positions[moved & old_visible])
+            self.mark_bobs_dirty(positions[moved & visible])
+            self._bobs_drawn = (positions, visible)
+            self._dirty_tiles &= view_tiles
+            self.redraw_dirty_tiles(self.visible_bobs(positions, visible))
+        self._view_tiles = view_tiles
         
         #self.generate_map(map)
     
-    # --- Gestion du liseré ---
-    
-    def calc_border_sprite(self, image: pygame.image, border_thickness) -> list:
-        border_coords = []
-        #pixels = pygame.PixelArray(image_copy)
-        for x in range(image.get_width()):
-            for y in range(image.get_height()):
-                pixel = image.get_at((x,y))
-                # Vérifiez si le pixel est transparent et s'il a un voisin non transparent
-                if pixel == (0, 0, 0, 0) and any(
-                        0 <= i < image.get_width() and 0 <= j < image.get_height() and image.get_at((i,j)) != (0, 0, 0, 0)
-                        for i in range(x - border_thickness, x + border_thickness + 1)
-                        for j in range(y - border_thickness, y + border_thickness + 1)
-                    ):
-                    border_coords.append((x,y))
-        return border_coords
-    
-    def apply_border(self, image: pygame.image, color: tuple, coords: tuple, border_thickness) -> pygame.image :
-        """
-        Applique un liserai de couleur à une image
-        """
-        image_copy = image.copy()
-        # Appliquez le liseré bleu autour du personnage avec l'épaisseur spécifiée
-        for coord in coords:
-            x,y = coord[0], coord[1]
-            for i in range(max(0, x - border_thickness), min(image_copy.get_width(), x + border_thickness + 1)):
-                for j in range(max(0, y - border_thickness), min(image_copy.get_height(), y + border_thickness + 1)):
-                    image_copy.set_at((x, y), pygame.Color(color[0], color[1], color[2]))
-        return image_copy
-
-    def choose_bob_border(self, bob) -> pygame.image:
-        health_ratio = bob.get_E() / bob.get_Emax() * 100
-        if health_ratio <= 20: return self.bob_with_border["20%"]
-        elif health_ratio <= 40: return self.bob_with_border["40%"]
-        elif health_ratio <= 60: return self.bob_with_border["60%"]
-        elif health_ratio <= 80: return self.bob_with_border["80%"]
-        else: return self.bob_with_border["100%"] 
-    
-    def load_sprite_with_halo(self, image: pygame.image, border_thickness):
-        sprite_border = self.calc_border_sprite(self.bob, border_thickness)
-        return {
-            "100%" : self.apply_border(image, (0,255,0), sprite_border, border_thickness),
-            "80%" : self.apply_border(image, (55,200,0), sprite_border, border_thickness),
-            "60%" : self.apply_border(image, (128,127,0), sprite_border, border_thickness),
-            "40%" : self.apply_border(image, (200,50,0), sprite_border, border_thickness),
-            "20%" : self.apply_border(image, (255,0,0), sprite_border, border_thickness)
-        }
-    
+    # --- Rafraîchissement partiel ---
+
+    def rect_tiles(self, rect: pygame.Rect):
+        """
+            Tuiles de rafraîchissement recouvertes par rect
+        """
+        for i in range(rect.left // DIRTY_TILE_SIZE, (rect.right - 1) // DIRTY_TILE_SIZE + 1):
+            for j in range(rect.top // DIRTY_TILE_SIZE, (rect.bottom - 1) // DIRTY_TILE_SIZE + 1):
+                yield i, j
+
+    def tiles_area(self, tiles: set) -> pygame.Rect:
+        """
+            Rectangle couvrant exactement un ensemble de tuiles
+        """
+        if not tiles: return pygame.Rect(0, 0, 0, 0)
+        i_min, i_max = min(i for i, _ in tiles), max(i for i, _ in tiles)
+        j_min, j_max = min(j for _, j in tiles), max(j for _, j in tiles)
+        return pygame.Rect(i_min * DIRTY_TILE_SIZE, j_min * DIRTY_TILE_SIZE,
+                           (i_max - i_min + 1) * DIRTY_TILE_SIZE, (j_max - j_min + 1) * DIRTY_TILE_SIZE)
+
+    def area_cells(self, area: pygame.Rect) -> tuple:
+        """
+            Plage de cases dont une entité peut recouvrir area : la zone est élargie de la taille des sprites,
+            qui débordent de leur case (vers le haut surtout)
+        """
+        sprite_size = max(self.bob.get_width(), self.bob.get_height(), self.apple.get_width(), self.apple.get_height())
+        return isometric.rect_to_cells(area.inflate(2 * sprite_size, 2 * sprite_size))
+
+    def mark_dirty(self, rect: pygame.Rect):
+        if rect is not None:
+            self._dirty_tiles.update(self.rect_tiles(rect))
+
+    def mark_bobs_dirty(self, positions: np.ndarray):
+        size = self.bob.get_size()
+        for pos in positions.tolist():
+            self.mark_dirty(pygame.Rect(pos, size))
+
+    def set_foods(self, snapshot):
+        """
+            Enregistre la nourriture du jour : l'ancienne et la nouvelle sont à redessiner
+        """
+        for _, _, rect in self._foods:
+            self.mark_dirty(rect)
+        self._foods = []
+        self._foods_by_tile = {}
+        for pos in self.entity_positions(self.apple, snapshot.get_foods_pos()).tolist():
+            rect = pygame.Rect(pos, self.apple.get_size())
+            self._foods.append((self.apple, pos, rect))
+            self.mark_dirty(rect)
+            for tile in self.rect_tiles(rect):
+                self._foods_by_tile.setdefault(tile, []).append((self.apple, pos))
+
+    def redraw_dirty_tiles(self, bobs: list):
+        """
+            Restaure le sol puis redessine nourriture et bobs uniquement dans les tuiles modifiées,
+            chaque tuile est découpée (clip) pour respecter l'ordre d'affichage des entités qui la débordent
+        """
+        if not self._dirty_tiles:
+            return
+        bobs_by_tile = {}
+        size = self.bob.get_size()
+        for sprite, pos in bobs:
+            for tile in self.rect_tiles(pygame.Rect(pos, size)):
+                if tile in self._dirty_tiles:
+                    bobs_by_tile.setdefault(tile, []).append((sprite, pos))
+        for tile in self._dirty_tiles:
+            area = pygame.Rect(tile[0] * DIRTY_TILE_SIZE, tile[1] * DIRTY_TILE_SIZE, DIRTY_TILE_SIZE, DIRTY_TILE_SIZE)
+            self.set_clip(area)
+            self.ground.draw(self, area, area.topleft)
+            for sprite, pos in self._foods_by_tile.get(tile, ()):
+                self.blit(sprite, pos)
+            for sprite, pos in bobs_by_tile.get(tile, ()):
+                self.blit(sprite, pos)
+        self.set_clip(None)
+        self._dirty_tiles.clear()
+
     # --- Autre ---
 
     def place_interface_in_middle(self, window):
@@ -239,17 +247,12 @@ class Interface(pygame.Surface):
         bob_attribs["buffer_dep"] = [0,0]
         return bob_attribs
     """
-    def init_values_bob_day(self, coord, bob):
-        bob_attribs = {}
-        bob_attribs["end_coords"] = coord
-        bob_attribs["last_move"] = bob.last_move
-        bob_attribs["image"] = self.choose_bob_border(bob)
-        return bob_attribs
-
 
         
-    def init_values_bobs_day(self, grid):
-        self._bobs_infos = []
-        for coord, bobs in grid.get_all_bobs().items():
-            for bob in bobs:
-                self._bobs_infos.append(self.init_values_bob_day(coord, bob))
+    def init_values_bobs_day(self, snapshot):
+        # les bobs de la veille sont à effacer, la nourriture du jour remplace l'ancienne
+        old_positions, old_visible = self._bobs_drawn
+        self.mark_bobs_dirty(old_positions[old_visible])
+        self.set_foods(snapshot)
+        super().init_values_bobs_day(snapshot)
+        self._bobs_drawn = (np.zeros((len(self._bobs_images), 2), dtype=int), np.zeros(len(self._bobs_images), dtype=bool))
@@ -15,11 +15,38 @@ transfer_cart_to_iso = np.array([
 
 transfer_iso_to_cart = np.linalg.inv(transfer_cart_to_iso)
 
+# les conversions acceptent une position (x, y) ou un tableau de positions de forme (n, 2),
+# converties toutes à la fois en un seul produit matriciel
+
 def cart_to_iso(pos: tuple) -> list:
-    return (transfer_cart_to_iso @ pos) + (Config.interface_x_offset, Config.interface_y_offset)
+    return (np.asarray(pos) @ transfer_cart_to_iso.T) + (Config.interface_x_offset, Config.interface_y_offset)
 
 def iso_to_cart(pos: tuple) -> list:
-    return transfer_iso_to_cart @ (pos - (Config.interface_x_offset, Config.interface_y_offset))
+    return (np.asarray(pos) - (Config.interface_x_offset, Config.interface_y_offset)) @ transfer_iso_to_cart.T
 
 def iso_to_print(pos: tuple) -> tuple:
-    return pos + (Config.height_map*tile_size/2, 0)
\ No newline at end of file
+    return pos + (Config.height_map*tile_size/2, 0)
+
+def print_to_iso(pos: tuple) -> tuple:
+    return pos - (Config.height_map*tile_size/2, 0)
+
+def rect_to_cells(rect, margin=1) -> tuple:
+    """
+        Plage de cases cartésiennes (x_min, x_max, y_min, y_max), bornes incluses, dont la projection
+        peut tomber dans rect (coordonnées de l'interface), élargie de margin cases
+    """
+    corners = np.array([rect.topleft, rect.topright, rect.bottomleft, rect.bottomright], dtype=float)
+    carts = iso_to_cart(print_to_iso(corners))
+    x_min, y_min = np.floor(carts.min(axis=0)).astype(int) - margin
+    x_max, y_max = np.ceil(carts.max(axis=0)).astype(int) + margin
+    return x_min, x_max, y_min, y_max
+
+# niveaux de zoom de l'affichage "viewport" : ZOOM_LEVELS_PER_DOUBLING échelles par doublement (2 ** (k / 8))
+ZOOM_LEVELS_PER_DOUBLING = 8
+
+def snap_scale(scale: float) -> float:
+    """
+        Niveau de zoom le plus proche de scale : les surfaces mises à l'échelle (sol, sprites) ne sont calculées
+        et gardées en cache que pour ces niveaux, quel que soit le zoom continu de la caméra
+    """
+    return 2 ** (round(np.log2(scale) * ZOOM_LEVELS_PER_DOUBLING) / ZOOM_LEVELS_PER_DOUBLING)
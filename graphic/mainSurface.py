@@ -5,11 +5,13 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import *
 
 from graphic.interface import Interface
+from graphic.viewportRenderer import ViewportRenderer
 from graphic.cameraController import CameraController
 from graphic.eventController import EventController
 from graphic.game_menu import GameMenu
 
 from logic.game import Game
+from profiler import PROFILER
 
 class MainSurface:
 
@@ -33,7 +35,7 @@ class MainSurface:
         # clock pour la gestion des FPS
         self.clock = pygame.time.Clock()
 
-        # surface du jeu, toute la map
+        # surface du jeu, toute la map (ou seulement sa taille en mode "viewport")
         self.game_surface = None
 
         self.camera = None
@@ -47,24 +49,33 @@ class MainSurface:
 
 
     def start_game(self):
-        self.game_surface = Interface(Config.screen_size)
+        if Config.render_mode == "viewport":
+            self.game_surface = ViewportRenderer(Config.screen_size)
+        else:
+            self.game_surface = Interface(Config.screen_size)
         #print(Config.width_map,Config.height_map)
         self.camera = CameraController(self.game_surface)
         self.menu.zoom_slider.set_value(self.camera.get_zoom_ratio())
         self.event_controller.camera = self.camera
+        if Config.profiling:
+            PROFILER.enable()
 
-    def run(self, grid):
+    def run(self, snapshot):
         current_tick = 1
         #current day ne sert qu'a l'affichage
-        self.game_surface.init_values_bobs_day(grid)
+        self.game_surface.init_values_bobs_day(snapshot)
 
         while(current_tick < max_framerate):
             self.event_controller.run_events()
 
             if self.menu.game_is_on:
-                self.game_surface.render_game(grid, current_tick)
-                self.window.blit(self.camera.get_viewpoint(), (0,0))
+                if Config.render_mode == "viewport":
+                    self.game_surface.render_view(self.window, snapshot, current_tick, self.camera.get_view_rect())
+                else:
+                    self.game_surface.render_game(snapshot, current_tick, self.camera.get_view_rect())
+                    self.window.blit(self.camera.get_viewpoint(), (0,0))
                 self.menu.game_screen.draw(self.window)
+                self.menu.draw_profiler(self.window)
                 
             else:
                 self.menu.main_menu.draw(self.window)
@@ -0,0 +1,39 @@
+import time
+import pygame
+import pygame_menu
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+from profiler import PROFILER
+
+# délai (en secondes) entre deux mises à jour du texte des percentiles
+OVERLAY_REFRESH = 0.25
+OVERLAY_MARGIN = 10
+
+class ProfilerOverlay:
+    """
+        Cadre semi-transparent des percentiles de durée de chaque phase (profiler.py), dessiné par-dessus le jeu
+    """
+
+    def __init__(self, profiler=PROFILER):
+        self.profiler = profiler
+        self.font = pygame.font.Font(pygame_menu.font.FONT_FIRACODE, 13)
+        self.surface = None
+        self.refresh_timer = 0
+
+    def refresh(self):
+        lines = [self.font.render(line, True, (255, 255, 255)) for line in self.profiler.report()]
+        width = max(line.get_width() for line in lines) + 2*OVERLAY_MARGIN
+        height = sum(line.get_height() for line in lines) + 2*OVERLAY_MARGIN
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 160))
+        y = OVERLAY_MARGIN
+        for line in lines:
+            self.surface.blit(line, (OVERLAY_MARGIN, y))
+            y += line.get_height()
+
+    def draw(self, target: pygame.Surface):
+        if (time.time() - self.refresh_timer) >= OVERLAY_REFRESH:
+            self.refresh()
+            self.refresh_timer = time.time()
+        target.blit(self.surface, (OVERLAY_MARGIN, OVERLAY_MARGIN))
@@ -0,0 +1,52 @@
+import pygame
+from collections import OrderedDict
+from graphic.isometric import snap_scale
+
+# nombre de niveaux de zoom dont l'atlas mis à l'échelle est gardé en mémoire
+SCALED_ATLAS_CACHE = 8
+# colonne transparente entre deux sprites, pour qu'un sprite mis à l'échelle ne prenne pas de pixel de son voisin
+ATLAS_PADDING = 2
+
+class SpriteAtlas():
+    """
+        Sprites du jeu rassemblés dans une seule surface. Pour chaque niveau de zoom (isometric.snap_scale),
+        l'atlas entier est mis à l'échelle en une fois et ses sprites sont des sous-surfaces du résultat ;
+        les SCALED_ATLAS_CACHE derniers niveaux utilisés sont gardés (LRU)
+    """
+    def __init__(self, sprites: dict):
+        width = sum(sprite.get_width() + ATLAS_PADDING for sprite in sprites.values())
+        height = max(sprite.get_height() for sprite in sprites.values())
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+        self.rects = {}
+        x = 0
+        for name, sprite in sprites.items():
+            # BLEND_RGBA_MAX sur un fond transparent recopie les pixels tels quels, transparence comprise
+            self.surface.blit(sprite, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[name] = pygame.Rect((x, 0), sprite.get_size())
+            x += sprite.get_width() + ATLAS_PADDING
+        self._scaled = OrderedDict() # échelle -> sprites à cette échelle, du moins au plus récemment utilisé
+        self._scaled[1] = {name: self.surface.subsurface(rect) for name, rect in self.rects.items()}
+
+    def sprites(self, scale=1) -> dict:
+        """
+            Nom -> sprite au niveau de zoom le plus proche de scale
+        """
+        # un zoom continu retombe sur quelques niveaux : l'atlas n'est pas remis à l'échelle à chaque image
+        scale = snap_scale(scale)
+        if scale in self._scaled:
+            self._scaled.move_to_end(scale)
+            return self._scaled[scale]
+        scaled = pygame.transform.scale(self.surface, (max(1, round(self.surface.get_width() * scale)),
+                                                       max(1, round(self.surface.get_height() * scale))))
+        sprites = {}
+        for name, rect in self.rects.items():
+            left, top = round(rect.left * scale), round(rect.top * scale)
+            width = max(1, round(rect.right * scale) - left)
+            height = max(1, round(rect.bottom * scale) - top)
+            sprites[name] = scaled.subsurface((left, top, min(width, scaled.get_width() - left), min(height, scaled.get_height() - top)))
+        self._scaled[scale] = sprites
+        # l'échelle 1 (sprites d'origine) n'est jamais retirée
+        while len(self._scaled) > SCALED_ATLAS_CACHE:
+            oldest = next(key for key in self._scaled if key != 1)
+            del self._scaled[oldest]
+        return sprites
@@ -0,0 +1,100 @@
+import numpy as np
+import pygame
+import graphic.isometric as isometric
+from graphic.gameRenderer import GameRenderer
+from graphic.groundChunks import GroundChunks
+from graphic.densityMap import DensityMap
+
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+class ViewportRenderer(GameRenderer):
+    """
+        Affichage du jeu dessiné directement dans la fenêtre, à sa résolution : seules les cases visibles sont
+        dessinées, avec des sprites mis à l'échelle une seule fois par niveau de zoom (SpriteAtlas).
+        Aucune surface de toute la carte n'est gardée, la mémoire ne dépend donc pas de la taille de la carte.
+        Pour CameraController, elle a la taille (virtuelle) de la carte en pixels.
+    """
+    def __init__(self, size):
+        self.map_width, self.map_height = int(size[0]), int(size[1])
+        self.init_renderer()
+        self.ground = GroundChunks(self.grass_tile)
+        self.density = DensityMap()
+
+    # --- Taille de la carte ---
+
+    def get_width(self) -> int:
+        return self.map_width
+
+    def get_height(self) -> int:
+        return self.map_height
+
+    def get_size(self) -> tuple:
+        return self.map_width, self.map_height
+
+    def get_rect(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, self.map_width, self.map_height)
+
+    # --- Mise à l'échelle ---
+
+    def scaled_sprites(self, scale: float) -> dict:
+        """
+            Sprite d'origine -> sprite à l'échelle scale, pris dans l'atlas mis à l'échelle pour ce zoom
+        """
+        sprites = self.atlas.sprites(scale)
+        scaled = {self.apple: sprites["apple"]}
+        for name, halo in self.bob_with_border.items():
+            scaled[halo] = sprites[f"bob_{name}"]
+        return scaled
+
+    def to_window(self, pos, origin: tuple, scale: float):
+        """
+            Position dans la fenêtre de points de la carte (en pixels de la carte, un point ou un tableau (n, 2)),
+            origin étant la position du coin de la fenêtre à l'échelle scale. Même arrondi que pour le sol (GroundChunks)
+        """
+        return np.floor(np.asarray(pos) * scale + 0.5).astype(int) - origin
+
+    # --- Dessin ---
+
+    def print_food(self, target: pygame.Surface, snapshot, origin: tuple, scale: float, sprites: dict, cells: tuple):
+        foods = snapshot.get_foods_pos()
+        foods = foods[self.in_cells(foods[:, 0], foods[:, 1], cells)]
+        positions = self.to_window(self.entity_positions(self.apple, foods), origin, scale).tolist()
+        apple = sprites[self.apple]
+        target.blits([(apple, pos) for pos in positions], False)
+
+    def move_bobs(self, target: pygame.Surface, current_tick, origin: tuple, scale: float, sprites: dict):
+        positions = self.to_window(self.bobs_screen_positions(current_tick), origin, scale)
+        size = np.ceil(np.array(self.bob.get_size()) * scale)
+        visible = ((positions < target.get_size()) & (positions + size > 0)).all(axis=1)
+        images = [image for image, is_visible in zip(self._bobs_images, visible.tolist()) if is_visible]
+        target.blits([(sprites[image], pos) for image, pos in zip(images, positions[visible].tolist())], False)
+
+    def render_view(self, target: pygame.Surface, snapshot, current_tick, view: pygame.Rect):
+        """
+            Dessine la frame current_tick de la zone view (rectangle visible de la caméra, en pixels de la carte)
+            sur toute la surface target
+        """
+        if target.get_width() / view.width * tile_size < density_cell_pixels:
+            # vue très dézoomée : moins de density_cell_pixels pixels par case, les sprites seraient minuscules et superposés
+            self.density.draw(target, view)
+            return
+        # échelle arrondie à un niveau de zoom : sol et sprites mis à l'échelle restent en cache pendant un zoom continu
+        scale = isometric.snap_scale(target.get_width() / view.width)
+        # zone de la carte réellement dessinée à cette échelle, centrée comme la vue de la caméra
+        drawn = pygame.Rect(0, 0, int(np.ceil(target.get_width() / scale)), int(np.ceil(target.get_height() / scale)))
+        drawn.center = view.center
+        sprites = self.scaled_sprites(scale)
+        sprite_size = max(self.bob.get_width(), self.bob.get_height(), self.apple.get_width(), self.apple.get_height())
+        cells = isometric.rect_to_cells(drawn.inflate(2 * sprite_size, 2 * sprite_size))
+
+        origin = tuple(self.to_window(drawn.topleft, (0, 0), scale).tolist())
+
+        self.ground.draw(target, pygame.Rect(origin, target.get_size()), (0, 0), scale)
+        self.print_food(target, snapshot, origin, scale, sprites, cells)
+        self.move_bobs(target, current_tick, origin, scale, sprites)
+
+    def init_values_bobs_day(self, snapshot):
+        super().init_values_bobs_day(snapshot)
+        self.density.update(snapshot)
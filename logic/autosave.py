@@ -0,0 +1,86 @@
+import glob
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from logic.checkpoint import game_checkpoint, write_checkpoint, read_checkpoint, CheckpointError
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Sauvegarde automatique des longues parties : tous les autosave_days jours, l'état de la partie est copié
+    entre deux jours puis écrit par un fil d'exécution dédié pendant que la simulation continue.
+    Les fichiers (autosave_000120.evo pour le jour 120) forment un anneau des autosave_keep derniers écrits ;
+    chacun est écrit à côté puis renommé, un arrêt brutal laisse donc toujours des sauvegardes complètes.
+"""
+
+AUTOSAVE_PATTERN = "autosave_*.evo"
+
+def autosave_name(day: int) -> str:
+    return f"autosave_{day:06d}.evo"
+
+def list_autosaves(directory=autosave_path) -> list:
+    """ Sauvegardes automatiques du dossier, de la plus ancienne à la plus récente (date d'écriture :
+        une nouvelle partie passe après les jours plus avancés d'une partie précédente)
+    """
+    return sorted(glob.glob(os.path.join(directory, AUTOSAVE_PATTERN)), key=os.path.getmtime)
+
+def latest_autosave(directory=autosave_path):
+    """ Sauvegarde automatique lisible la plus récente du dossier, None s'il n'y en a pas
+    """
+    for path in reversed(list_autosaves(directory)):
+        try:
+            read_checkpoint(path)
+            return path
+        except (OSError, ValueError, CheckpointError):
+            continue
+    return None
+
+
+class Autosaver():
+    """ Planificateur de sauvegardes automatiques, appelé par la boucle des jours (after_day)
+    """
+    def __init__(self, every=None, keep=autosave_keep, directory=autosave_path):
+        """
+        Raises:
+            ValueError: si keep < 1 (l'anneau ne pourrait garder aucune sauvegarde)
+        """
+        if keep < 1:
+            raise ValueError(f"autosave_keep doit valoir au moins 1 (reçu : {keep})")
+        self.every = Config.autosave_days if every is None else every
+        self.keep = keep
+        self.directory = directory
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending = None # écriture en cours
+
+    def after_day(self, game):
+        """ À appeler entre deux jours (la partie ne doit pas être en train de jouer) :
+            copie l'état si game.day est un multiple de every et en lance l'écriture
+        """
+        if not self.every or game.day % self.every:
+            return
+        header, arrays = game_checkpoint(game)
+        # la partie continue pendant l'écriture : les colonnes ne doivent plus partager sa mémoire
+        arrays = {name: np.array(array) for name, array in arrays.items()}
+        # une seule écriture à la fois : si la précédente n'est pas finie, on l'attend (mémoire bornée)
+        self.wait()
+        self._pending = self._executor.submit(self.write, os.path.join(self.directory, autosave_name(game.day)), header, arrays)
+
+    def write(self, path: str, header: dict, arrays: dict):
+        write_checkpoint(path, header, arrays)
+        for old in list_autosaves(self.directory)[:-self.keep]:
+            os.remove(old)
+
+    def wait(self):
+        """ Attend la fin de l'écriture en cours. Une sauvegarde ratée (disque plein...) est signalée
+            sans arrêter la partie
+        """
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            try:
+                pending.result()
+            except OSError as error:
+                print(f"sauvegarde automatique impossible : {error}", file=sys.stderr)
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown()
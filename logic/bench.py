@@ -0,0 +1,116 @@
+import argparse
+import csv
+import json
+import time
+import tracemalloc
+import numpy as np
+from logic.game import create_game
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Mesures des chemins critiques de la logique, pour suivre les régressions sous forme de courbes :
+
+        python -m logic.bench --sizes 100,300,1000 --populations 100,1000,10000,100000 --output bench.csv
+
+    Pour chaque taille de carte et chaque population : opérations par seconde (meilleur de plusieurs essais)
+    et pic de mémoire allouée pendant l'opération (tracemalloc, mesuré à part pour ne pas fausser le temps).
+    La quantité de nourriture par jour vaut deux fois la population.
+"""
+
+def measure(func, setup=None, repeat=3, number=1) -> dict:
+    """ Chronomètre func (appelée number fois après setup) et mesure son pic de mémoire
+
+    Returns:
+        dict: ops_per_sec (meilleur essai), seconds_per_op et peak_memory_kb
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup: setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    if setup: setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ops_per_sec": number / best if best else float("inf"), "seconds_per_op": best / number,
+            "peak_memory_kb": peak / 1024}
+
+def bench_case(engine: str, size: int, population: int, repeat: int, seed=0) -> list:
+    """ Toutes les mesures pour une carte size x size et une population initiale donnée
+    """
+    config = Config()
+    load_config({"width_map": size, "height_map": size, "P0": population,
+                 "quantity_food": 2 * population, "engine": engine}, config)
+    results = {}
+
+    results["game_init"] = measure(lambda: create_game(engine, config, seed), repeat=repeat)
+    game = create_game(engine, config, seed)
+    # chaque essai de day_play repart de l'état initial (population, nourriture et générateur aléatoire) :
+    # tous jouent le même jour, sur la même population. Copies : le moteur vectoriel modifie ses colonnes en place
+    values, arrays = game.checkpoint_state()
+    arrays = {name: np.array(array) for name, array in arrays.items()}
+    restored = []
+    def restore():
+        restored[:] = [create_game(engine, config, populate=False)]
+        restored[0].restore_state(values, arrays)
+    results["day_play"] = measure(lambda: restored[0].day_play(), setup=restore, repeat=repeat)
+    results["render_snapshot"] = measure(game.render_snapshot, repeat=repeat)
+    destroy_all_foods = game.grid.destroy_all_foods if engine == "object" else game.destroy_all_foods
+    results["destroy_all_foods"] = measure(destroy_all_foods, setup=game.spawn_food, repeat=repeat)
+    game.spawn_food()
+
+    if engine == "object":
+        grid = game.grid
+        bobs = list(grid.registry)
+        results["iter_bobs_tick"] = measure(lambda: [bob for bob in grid.iter_bobs_tick()], repeat=repeat)
+        results["get_position"] = measure(lambda: [grid.get_position(bob) for bob in bobs], repeat=repeat)
+        results["bob_move"] = measure(lambda: [bob.move(game.rng) for bob in bobs], repeat=repeat)
+        results["bob_parthenogenesis"] = measure(lambda: [bob.parthenogenesis(config, game.rng) for bob in bobs], repeat=repeat)
+        # ces quatre mesures portent sur toute la population : ramenées à un appel
+        for name in ("iter_bobs_tick", "get_position", "bob_move", "bob_parthenogenesis"):
+            results[name]["ops_per_sec"] *= len(bobs)
+            results[name]["seconds_per_op"] /= max(len(bobs), 1)
+
+    return [{"benchmark": name, "engine": engine, "width": size, "height": size, "population": population, **values}
+            for name, values in results.items()]
+
+def write_report(rows: list, path: str):
+    """ Écrit le rapport en CSV ou en JSON selon l'extension du fichier
+    """
+    with open(path, "w", newline="") as f:
+        if path.endswith(".json"):
+            json.dump(rows, f, indent=1)
+        else:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m logic.bench", description="Mesures des chemins critiques de la logique")
+    parser.add_argument("--sizes", default="100,300,1000", help="côtés de carte, séparés par des virgules")
+    parser.add_argument("--populations", default="100,1000,10000,100000", help="populations initiales")
+    parser.add_argument("--engine", default="object", choices=("object", "vector"))
+    parser.add_argument("--repeat", type=int, default=3, help="nombre d'essais par mesure (le meilleur est gardé)")
+    parser.add_argument("--output", default="bench.csv", help="rapport .csv ou .json")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in map(int, args.sizes.split(",")):
+        for population in map(int, args.populations.split(",")):
+            if population > size * size // 2:
+                print(f"{size}x{size}, {population} bobs : carte trop petite, ignoré", file=sys.stderr)
+                continue
+            case = bench_case(args.engine, size, population, args.repeat)
+            rows.extend(case)
+            print(f"{size}x{size}, {population} bobs : " +
+                  ", ".join(f"{row['benchmark']} {row['ops_per_sec']:.3g}/s" for row in case), file=sys.stderr)
+            write_report(rows, args.output)
+
+if __name__ == '__main__':
+    main()
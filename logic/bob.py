@@ -11,9 +11,9 @@ class Bob():
     Echild=50
     
     
-    def __init__(self,E=Emax//2, speed=0, mass=0, memory=0, perception=0):
+    def __init__(self,E=Emax//2, speed=0, mass=0, memory=0, perception=0, config=Config):
         self.E=E
-        self.apply_stats(speed, mass, memory, perception)
+        self.apply_stats(speed, mass, memory, perception, config)
         self.last_move=[0,0]
         self.speed_buff = 0.0
         
@@ -62,11 +62,13 @@ class Bob():
     def set_Echild(cls,E):
         cls.Echild=E  
 
-    def apply_stats(self, speed=0, mass=0, memory=0, perception=0):
-        if not speed: speed=Config.bob_speed
-        if not mass: mass=Config.bob_mass
-        if not memory: memory=Config.bob_memory
-        if not perception: perception=Config.bob_perception
+    def apply_stats(self, speed=0, mass=0, memory=0, perception=0, config=Config):
+        """ Les caractéristiques nulles prennent la valeur par défaut de la configuration (classe Config ou instance)
+        """
+        if not speed: speed=config.bob_speed
+        if not mass: mass=config.bob_mass
+        if not memory: memory=config.bob_memory
+        if not perception: perception=config.bob_perception
 
         self.speed = speed
         self.mass = mass
@@ -74,12 +76,28 @@ class Bob():
         self.perception = perception
         self.stats = [self.speed, self.mass, self.memory, self.perception]
     
+    @classmethod
+    def from_state(cls, E, speed, mass, memory, perception, speed_buff, last_move):
+        """ Recrée un bob sauvegardé : contrairement au constructeur, une caractéristique nulle reste nulle
+        """
+        bob = cls.__new__(cls)
+        bob.E = E
+        bob.speed = speed
+        bob.mass = mass
+        bob.memory = memory
+        bob.perception = perception
+        bob.stats = [speed, mass, memory, perception]
+        bob.last_move = last_move
+        bob.speed_buff = speed_buff
+        return bob
+
     def reset_last_move(self):
         self.set_last_move([0,0])
       
-    def move(self) -> tuple:
+    def move(self, rng=random) -> tuple:
         """Déplace Bob en choisissant aléatoirement une direction  
             la gestion ce fait dans la class Game
+            rng: générateur aléatoire de la partie (logic.rng.BatchedRandom), le module random par défaut
             return: les nouvelles coordonnées de bob 
         """
         #Version sans vision
@@ -87,8 +105,8 @@ class Bob():
         speed_mouvement= int(self.speed_buff)
         self.speed_buff -= speed_mouvement
         last_mov = self.get_last_move()
-        add_x = random.randint(0, speed_mouvement) * random.choice((1,-1))
-        add_y = (speed_mouvement - abs(add_x)) * random.choice((1,-1))
+        add_x = rng.randint(0, speed_mouvement) * rng.choice((1,-1))
+        add_y = (speed_mouvement - abs(add_x)) * rng.choice((1,-1))
         
         self.last_move=[
                             last_mov[0] + add_x, 
@@ -124,8 +142,11 @@ class Bob():
         """
         return self.E <=0
     
-    def parthenogenesis(self) -> object:
+    def parthenogenesis(self, config=Config, rng=random) -> object:
         """si bob atteint l'energie maximal il aura un bebe
+        Args:
+            config (Config): configuration de la partie (taux de mutation, caractéristiques par défaut)
+            rng: générateur aléatoire de la partie, le module random par défaut
         Returns:
             BOB: si il ya une parthenogenesis
             -1 sinon
@@ -133,12 +154,12 @@ class Bob():
         self.E=self.Emax-self.Emother
         child_stats = []
         for stat in self.stats:
-            child_stat = stat + random.uniform(-mutation_rate, mutation_rate)
+            child_stat = stat + rng.uniform(-config.mutation_rate, config.mutation_rate)
             if child_stat < 0:
                 child_stat = 0
             child_stats.append(child_stat)
             
-        return Bob(Bob.Echild, *child_stats)   
+        return Bob(Bob.Echild, *child_stats, config=config)   
         
     def get_stats(self):
         return [self.E, self.speed, self.mass, self.memory, self.perception]
@@ -0,0 +1,129 @@
+import json
+import struct
+import numpy as np
+from logic.bob import Bob
+from logic.game import create_game
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Format de sauvegarde d'une partie (moteur "object" ou "vector") :
+
+        MAGIC (8 octets) | version (uint32) | taille de l'en-tête (uint32) | en-tête JSON | colonnes
+
+    L'en-tête donne les paramètres de la partie, le jour, l'état du générateur aléatoire et, pour chaque colonne
+    (une caractéristique des bobs, l'énergie de nourriture par case...), son type, sa forme et sa position
+    dans le fichier. Les colonnes sont des tableaux NumPy bruts alignés sur ALIGNMENT octets :
+    read_checkpoint les lit sans copie par np.memmap.
+"""
+
+MAGIC = b"EVOSAVE\0"
+VERSION = 1
+PREAMBLE = struct.Struct("<8sII")
+# alignement (en octets) du début de chaque colonne dans le fichier
+ALIGNMENT = 64
+
+# paramètres de Config enregistrés avec la partie et rétablis au chargement
+GAME_PARAMETERS = (
+    "width_map", "height_map", "quantity_food", "energy_food", "nb_tick_day", "P0",
+    "bob_speed", "bob_mass", "bob_memory", "bob_perception", "mutation_rate", "engine",
+)
+
+class CheckpointError(ValueError):
+    """ Fichier qui n'est pas une sauvegarde, ou d'une version inconnue
+    """
+
+def align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def write_checkpoint(path: str, header: dict, arrays: dict):
+    """ Écrit l'en-tête et les colonnes dans path. Le fichier est écrit à côté puis renommé :
+        une sauvegarde interrompue ne remplace jamais la précédente
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    directory = {}
+    offset = 0
+    for name, array in arrays.items():
+        directory[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = align(offset + array.nbytes)
+    header = json.dumps({**header, "arrays": directory}).encode()
+    # les positions des colonnes sont relatives à la fin de l'en-tête
+    start = align(PREAMBLE.size + len(header))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(start + directory[name]["offset"])
+            f.write(memoryview(array).cast("B"))
+    os.replace(tmp_path, path)
+
+def read_checkpoint(path: str) -> tuple:
+    """ Lit une sauvegarde : en-tête (dict) et colonnes, vues en lecture seule du fichier projeté en mémoire
+
+    Raises:
+        CheckpointError: si le fichier n'est pas une sauvegarde de cette version
+    """
+    with open(path, "rb") as f:
+        magic, version, header_size = PREAMBLE.unpack(f.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise CheckpointError(f"{path} n'est pas une sauvegarde")
+        if version != VERSION:
+            raise CheckpointError(f"{path} : version de sauvegarde {version} inconnue (attendue : {VERSION})")
+        header = json.loads(f.read(header_size))
+    start = align(PREAMBLE.size + header_size)
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, column in header.pop("arrays").items():
+        dtype = np.dtype(column["dtype"])
+        size = int(np.prod(column["shape"])) * dtype.itemsize
+        begin = start + column["offset"]
+        arrays[name] = data[begin:begin + size].view(dtype).reshape(column["shape"])
+    return header, arrays
+
+def game_checkpoint(game) -> tuple:
+    """ En-tête et colonnes de la sauvegarde de la partie (Game ou VectorGame)
+        Les colonnes peuvent partager la mémoire de la partie : à copier si elle continue avant leur écriture
+    """
+    values, arrays = game.checkpoint_state()
+    header = {
+        "config": {name: getattr(game.config, name) for name in GAME_PARAMETERS},
+        "energies": {"Emax": Bob.get_Emax(), "Emother": Bob.get_Emother(), "Echild": Bob.get_Echild()},
+        "bobs": game.count_bobs(),
+        **values,
+    }
+    return header, arrays
+
+def save_game(game, path=save_file):
+    """ Sauvegarde la partie (Game ou VectorGame) dans path
+    """
+    write_checkpoint(path, *game_checkpoint(game))
+
+def apply_header(header: dict, config=Config):
+    """ Applique à config (classe Config ou instance) et à Bob les paramètres de la partie sauvegardée
+    """
+    load_config(header["config"], config)
+    Bob.set_Emax(header["energies"]["Emax"])
+    Bob.set_Emother(header["energies"]["Emother"])
+    Bob.set_Echild(header["energies"]["Echild"])
+
+def load_game_config(path=save_file, config=Config) -> dict:
+    """ Applique les paramètres de la partie sauvegardée dans path sans la recréer, retourne son en-tête
+        (le processus d'affichage en a besoin quand la partie est chargée par le processus de logique)
+    """
+    header, _ = read_checkpoint(path)
+    apply_header(header, config)
+    return header
+
+def load_game(path=save_file, config=Config):
+    """ Recrée la partie sauvegardée dans path. Ses paramètres sont d'abord appliqués à config
+        (classe Config ou instance), le moteur est celui de la sauvegarde
+    """
+    header, arrays = read_checkpoint(path)
+    apply_header(header, config)
+    game = create_game(header["config"]["engine"], config, populate=False)
+    game.restore_state(header, arrays)
+    return game
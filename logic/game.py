@@ -1,83 +1,205 @@
+import gc
+from itertools import chain
+import numpy as np
 from logic.bob import Bob
-from logic.food import Food
 from logic.grid import Grid
+from logic.rng import BatchedRandom
+from logic.metrics import DayMetrics
+from logic.journal import STARVATION, BORDER
+from logic.snapshot import RenderSnapshot, SnapshotBuffer
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import *
 
 class Game():
-    def __init__(self):
-        self.grid=Grid()
-        self.init_bobs()
-        self.spawn_food()
+    def __init__(self, config=Config, seed=None, populate=True):
+        # configuration propre à la partie : la classe Config ou une instance (plusieurs parties isolées)
+        self.config=config
+        # générateur aléatoire de la partie, partagé par la grille et les bobs : même graine, même partie
+        self.rng=BatchedRandom(seed)
+        self.grid=Grid(config, self.rng)
+        self.render_buffer=SnapshotBuffer()
+        # nombre de jours joués depuis le début de la partie
+        self.day=0
+        # mesures du jour tenues au fil des événements (logic.metrics)
+        self.metrics=DayMetrics()
+        # journal des événements (logic.journal.EventJournal), branché par EventJournal.start
+        self.journal=None
+        # populate=False : grille vide, remplie ensuite par restore_state (chargement d'une sauvegarde)
+        if populate:
+            self.init_bobs()
+            self.spawn_food()
         
     
     def init_bobs(self):
         """init bob
             initialisation des P0 bobs dans exactement P0 places
         """
-        for _ in range(Config.P0):
+        for _ in range(self.config.P0):
             is_spawn = False
             while not is_spawn :
                 pos = self.grid.choose_random_tile()
                 if not self.grid.has_bob(pos):
                     is_spawn = True
-            self.grid.create_bob(pos)
+            self.metrics.add_bob(self.grid.create_bob(pos))
           
     def spawn_food(self):
         """generer la nouritures
         """
-        for _ in range(Config.quantity_food):
+        for _ in range(self.config.quantity_food):
             pos = self.grid.choose_random_tile()
-            self.grid.map[pos].append(Food())
+            self.grid.add_food(pos, self.config.energy_food)
+            if self.journal: self.journal.food(pos, self.config.energy_food)
 
     def bob_play_tick(self, bob: Bob, pos=None):
         if pos == None:
             pos = self.grid.get_position(bob)
         if bob.get_E() == Bob.get_Emax():
-            self.grid.place_child(bob.parthenogenesis(), pos)          
+            child = bob.parthenogenesis(self.config, self.rng)
+            self.grid.place_child(child, pos)
+            self.metrics.birth(child)
+            if self.journal: self.journal.birth(bob, child, self.grid.get_position(child))
         elif (food := self.grid.has_food(pos)):
+            energy = food.energy
             if bob.eat(food):
                 self.grid.destroy_object(food, pos)
+            self.metrics.eat(energy - food.energy)
+            if self.journal: self.journal.eat(bob, pos, food)
             
         else:
-            mouv = bob.move()
+            mouv = bob.move(self.rng)
             new_pos = pos[0] + mouv[0], pos[1] + mouv[1]
             if self.grid.is_pos_in_map(new_pos):
-                self.grid.map[new_pos].append(bob)
-                self.grid.destroy_object(bob, pos)
+                self.grid.move_object(bob, pos, new_pos)
+                if self.journal: self.journal.move(bob, mouv)
                 if (food := self.grid.has_food(new_pos)):
                     bob.E += 0.5 # Compence l'effet de manger juste après
+                    energy = food.energy
                     if bob.eat(food):
                         self.grid.destroy_object(food, new_pos)
+                    self.metrics.eat(energy - food.energy)
+                    if self.journal: self.journal.eat(bob, new_pos, food)
                 if bob.is_dead():
                     self.grid.destroy_object(bob, new_pos)
+                    self.metrics.death(bob, "starvation")
+                    if self.journal: self.journal.death(bob, STARVATION)
                 else:
                     bobs=self.grid.bobs_in_case(new_pos)
                     for target in bobs :
                         if bob.attack(target):
                             self.grid.destroy_object(target,new_pos)
+                            self.metrics.death(target, "attack")
+                            if self.journal: self.journal.kill(bob, target)
                             break
-            else: self.grid.destroy_object(bob, pos)
+            else:
+                self.grid.destroy_object(bob, pos)
+                self.metrics.death(bob, "border")
+                if self.journal: self.journal.death(bob, BORDER)
 
     def reset_bobs_last_move(self):
-        bobs_map = self.grid.get_all_bobs()
-        for _, bobs in bobs_map.items():
-            for bob in bobs:
-                bob.reset_last_move()
+        for bob in self.grid.registry:
+            bob.reset_last_move()
 
     def bobs_play_tick(self):
-        bobs_map = self.grid.get_all_bobs()
-        for pos, bobs in bobs_map.items():
-            for bob in bobs:
-                self.bob_play_tick(bob, pos)
+        for bob in self.grid.iter_bobs_tick():
+            self.bob_play_tick(bob)
     
     def bobs_play_day(self):
-        for _ in range(nb_ticks_day):
+        for _ in range(self.config.nb_tick_day):
             self.bobs_play_tick()
                 
     def day_play(self):
+        self.metrics.start_day()
         self.reset_bobs_last_move()
         self.bobs_play_day()
         self.grid.destroy_all_foods()
-        self.spawn_food()
\ No newline at end of file
+        self.spawn_food()
+        self.day += 1
+        if self.journal: self.journal.end_day(self)
+
+    def count_bobs(self) -> int:
+        return len(self.grid.registry)
+
+    def get_stats(self) -> dict:
+        """ Statistiques de la population courante (nombre de bobs, cases de nourriture, moyennes)
+        """
+        bobs = self.grid.registry
+        nb_bobs = len(bobs)
+        return {
+            "bobs": nb_bobs,
+            "foods": len(self.grid.foods),
+            "mean_energy": sum(bob.E for bob in bobs) / nb_bobs if nb_bobs else 0,
+            "mean_speed": sum(bob.speed for bob in bobs) / nb_bobs if nb_bobs else 0,
+            "mean_mass": sum(bob.mass for bob in bobs) / nb_bobs if nb_bobs else 0,
+        }
+
+    def render_snapshot(self) -> RenderSnapshot:
+        """ Remplit l'instantané d'affichage arrière avec l'état courant puis l'échange avec l'avant
+            L'instantané retourné reste valide pendant le jour suivant, qui remplit l'autre tampon
+        """
+        positions, last_moves, energies = [], [], []
+        for bob in self.grid.registry:
+            positions.append(self.grid.positions[bob])
+            last_moves.append(bob.last_move)
+            energies.append(bob.E)
+        self.render_buffer.back.write(positions, last_moves, energies, Bob.get_Emax(), list(self.grid.foods))
+        return self.render_buffer.swap()
+
+    def checkpoint_state(self) -> tuple:
+        """ État complet de la partie pour une sauvegarde (logic.checkpoint) : valeurs simples et colonnes NumPy
+            des bobs dans l'ordre du registre, rang de chaque bob dans la liste de sa case, énergie de nourriture par case
+        """
+        grid = self.grid
+        ranks = {bob: rank for bobs in grid.bobs.values() for rank, bob in enumerate(bobs)}
+        bobs = list(grid.registry)
+        positions = np.fromiter(chain.from_iterable([grid.positions[bob] for bob in bobs]), np.int32, 2 * len(bobs)).reshape(-1, 2)
+        food = np.zeros((self.config.width_map, self.config.height_map))
+        cells = np.fromiter(chain.from_iterable(grid.foods), np.intp, 2 * len(grid.foods)).reshape(-1, 2)
+        food[cells[:, 0], cells[:, 1]] = [item.energy for item in grid.foods.values()]
+        rng_state = self.rng.get_state()
+        arrays = {
+            "x": positions[:, 0], "y": positions[:, 1],
+            "E": np.array([bob.E for bob in bobs], dtype=float),
+            "speed": np.array([bob.speed for bob in bobs], dtype=float),
+            "mass": np.array([bob.mass for bob in bobs], dtype=float),
+            "memory": np.array([bob.memory for bob in bobs], dtype=float),
+            "perception": np.array([bob.perception for bob in bobs], dtype=float),
+            "speed_buff": np.array([bob.speed_buff for bob in bobs], dtype=float),
+            "last_move": np.fromiter(chain.from_iterable([bob.last_move for bob in bobs]), np.int64, 2 * len(bobs)).reshape(-1, 2),
+            "cell_rank": np.array([ranks[bob] for bob in bobs], dtype=np.int32),
+            "food": food,
+            "rng_buffer": np.array(rng_state["buffer"], dtype=float),
+        }
+        return {"day": self.day, "rng": rng_state["bit_generator"]}, arrays
+
+    def restore_state(self, values: dict, arrays: dict):
+        """ Remplace l'état de la partie par celui d'une sauvegarde (inverse de checkpoint_state)
+        """
+        self.day = values["day"]
+        self.rng.set_state({"bit_generator": values["rng"], "buffer": arrays["rng_buffer"].tolist()})
+        # les objets créés ici vivent tous jusqu'à la fin du chargement : le ramasse-miettes ne ferait que les parcourir
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            bobs = [Bob.from_state(*fields) for fields in zip(
+                arrays["E"].tolist(), arrays["speed"].tolist(), arrays["mass"].tolist(), arrays["memory"].tolist(),
+                arrays["perception"].tolist(), arrays["speed_buff"].tolist(), arrays["last_move"].tolist())]
+            cells = list(zip(arrays["x"].tolist(), arrays["y"].tolist()))
+            # chaque case retrouve ses bobs dans l'ordre d'origine (l'ordre des attaques en dépend)
+            order = np.lexsort((arrays["cell_rank"], arrays["y"], arrays["x"])).tolist()
+            self.grid.load_bobs(bobs, cells, order)
+            xs, ys = np.nonzero(arrays["food"])
+            self.grid.load_foods(zip(xs.tolist(), ys.tolist()), arrays["food"][xs, ys].tolist())
+            self.metrics.count_population(arrays)
+        finally:
+            if gc_enabled: gc.enable()
+
+
+def create_game(engine=None, config=Config, seed=None, populate=True):
+    """ Crée le moteur de simulation choisi : "object" (Game) ou "vector" (logic.vector_engine.VectorGame)
+        Par défaut celui de config.engine. Une même graine redonne exactement la même partie
+    """
+    if (engine or config.engine) == "vector":
+        from logic.vector_engine import VectorGame
+        return VectorGame(config, seed, populate)
+    return Game(config, seed, populate)
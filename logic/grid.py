@@ -1,4 +1,3 @@
-from collections import defaultdict
 import random
 
 import logic.bob
@@ -9,87 +8,205 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import *
 
 class Grid():
-    def __init__(self):
-        self.map=defaultdict(lambda:[])
-    
+    def __init__(self, config=Config, rng=random, check_consistency=False):
+        # configuration de la partie (classe Config ou instance propre à la partie)
+        self.config=config
+        # générateur aléatoire de la partie (logic.rng.BatchedRandom), le module random par défaut
+        self.rng=rng
+        # stockage par type : seules les cases occupées sont des clés, les clés forment donc
+        # l'ensemble des cases occupées, maintenu à chaque ajout / déplacement / destruction
+        self.bobs={}   # case -> liste des bobs de la case
+        self.foods={}  # case -> Food portant l'énergie totale de nourriture de la case
+        # index inverse objet -> position, maintenu à chaque ajout / déplacement / destruction
+        self.positions={}
+        # registre des bobs vivants dans leur ordre d'arrivée dans la grille (dict utilisé comme ensemble ordonné)
+        self.registry={}
+        # mode de vérification pour les tests : contrôle l'index après chaque modification
+        self.check_consistency=check_consistency
+
     def get_position(self,obj) -> tuple:
         """ la fonction get_position permet de donner la position dans la grille d'un objet passe en parametres
+            Retourne None si l'objet n'est pas dans la grille
+        """
+        return self.positions.get(obj)
+
+    def add_object(self, obj, pos: tuple):
+        """ Ajoute un objet à la position donnée et met à jour l'index
+            Une nourriture posée sur une case qui en contient déjà vient s'ajouter à l'énergie de celle-ci
+        """
+        if isinstance(obj, logic.food.Food):
+            self.add_food(pos, obj.get_energy())
+            return
+        if pos in self.bobs: self.bobs[pos].append(obj)
+        else: self.bobs[pos] = [obj]
+        self.positions[obj]=pos
+        self.registry[obj]=None
+        if self.check_consistency: self.check_index()
+
+    def add_food(self, pos: tuple, energy):
+        """ Ajoute de l'énergie de nourriture sur une case, en créant la nourriture si besoin
+        """
+        if pos in self.foods:
+            food = self.foods[pos]
+            food.set_energy(food.get_energy() + energy)
+        else:
+            food = logic.food.Food(energy)
+            self.foods[pos] = food
+            self.positions[food]=pos
+        if self.check_consistency: self.check_index()
+
+    def move_object(self, obj, pos: tuple, new_pos: tuple):
+        """ Déplace un bob de pos vers new_pos, le bob est placé en fin de liste de la nouvelle case
+        """
+        if new_pos in self.bobs: self.bobs[new_pos].append(obj)
+        else: self.bobs[new_pos] = [obj]
+        if obj in (bobs := self.bobs[pos]):
+            bobs.remove(obj)
+            if bobs == []:
+                del self.bobs[pos]
+        self.positions[obj]=new_pos
+        if self.check_consistency: self.check_index()
+
+    def check_index(self):
+        """ Vérifie que l'index objet -> position correspond exactement au contenu de la carte
+
+        Raises:
+            AssertionError: si l'index et la carte divergent
         """
-        for key, itms in self.map.items():
-            for itm in itms:
-                if id(itm) == id(obj):
-                    return key  # Retourne les coordonnées (x, y) d'objet recherché
-    
+        count = 0
+        for pos, items in self.bobs.items():
+            if items == []:
+                raise AssertionError(f"case {pos} vide conservée dans les bobs")
+            for item in items:
+                count += 1
+                if self.positions.get(item) != pos:
+                    raise AssertionError(f"index incohérent pour {item!r} : {self.positions.get(item)} au lieu de {pos}")
+        for pos, food in self.foods.items():
+            count += 1
+            if self.positions.get(food) != pos:
+                raise AssertionError(f"index incohérent pour {food!r} : {self.positions.get(food)} au lieu de {pos}")
+        if count != len(self.positions):
+            raise AssertionError(f"index incohérent : {len(self.positions)} entrées pour {count} objets")
+        if len(self.registry) != count - len(self.foods) or any(bob not in self.positions for bob in self.registry):
+            raise AssertionError("registre des bobs incohérent avec la carte")
+
+    def iter_bobs_tick(self):
+        """ Parcourt les bobs vivants au début du tick dans l'ordre du registre.
+            Les bobs nés pendant le parcours attendent le tick suivant, ceux détruits pendant le parcours sont ignorés
+        """
+        for bob in tuple(self.registry):
+            if bob in self.registry:
+                yield bob
+
     def get_items(self,pos) -> list:
         """ Retourne la liste des objets à la clé (x, y), ou une liste vide s'il n'y a pas d'objet à cet endroit
         """
-        return self.map[pos]
-    
+        items = list(self.bobs.get(pos, ()))
+        if pos in self.foods: items.append(self.foods[pos])
+        return items
+
     def has_object(self, obj, pos):
-        for item in self.get_items(pos):
-            if isinstance(item, type(obj)):
-                return item
+        if isinstance(obj, logic.bob.Bob): return self.has_bob(pos)
+        if isinstance(obj, logic.food.Food): return self.has_food(pos)
         return False
-        
+
     def has_bob(self, pos) -> bool:
-        return self.has_object(logic.bob.Bob(), pos)
-    
+        """ Retourne le premier bob de la case, False s'il n'y en a pas
+        """
+        if pos in self.bobs:
+            return self.bobs[pos][0]
+        return False
+
     def has_food(self, pos) -> bool:
-        return self.has_object(logic.food.Food(), pos)
-    
+        """ Retourne la nourriture de la case, False s'il n'y en a pas
+        """
+        return self.foods.get(pos, False)
+
     def choose_random_tile(self):
-        return random.randint(0, Config.width_map-1), random.randint(0, Config.height_map-1)
-    
+        return self.rng.randint(0, self.config.width_map-1), self.rng.randint(0, self.config.height_map-1)
+
     def destroy_object(self,obj, pos=None):
         """_Destroys the given object.__
 
         Args:
-            obj (food / bob): 
+            obj (food / bob):
         """
         if pos == None :
             pos = self.get_position(obj)
-        if obj in self.map[pos]:
-            self.map[pos].remove(obj)
-            if self.map[pos] == []:
-                del self.map[pos]
-    
+            if pos == None: return
+        if isinstance(obj, logic.food.Food):
+            if self.foods.get(pos) is obj:
+                del self.foods[pos]
+                del self.positions[obj]
+        elif obj in (bobs := self.bobs.get(pos, ())):
+            bobs.remove(obj)
+            if bobs == []:
+                del self.bobs[pos]
+            del self.positions[obj]
+            del self.registry[obj]
+        if self.check_consistency: self.check_index()
+
     def get_all_object_in_map(self, obj) -> dict:
-        obj_dict=defaultdict(lambda:[])
-        for pos, items in self.map.items():
-            for item in items:
-                if isinstance(item,type(obj)):
-                    obj_dict[pos].append(item)
-        return obj_dict
-    
-    def get_all_bobs(self):
-        return self.get_all_object_in_map(logic.bob.Bob())
-    
-    def get_all_foods(self):
-        return self.get_all_object_in_map(logic.food.Food())
-    
+        if isinstance(obj, logic.bob.Bob): return self.get_all_bobs()
+        if isinstance(obj, logic.food.Food): return self.get_all_foods()
+        return {}
+
+    def get_all_bobs(self) -> dict:
+        """ Retourne les bobs par case occupée (case -> liste des bobs)
+            Attention : c'est le stockage de la grille, il ne doit pas être modifié pendant l'itération
+        """
+        return self.bobs
+
+    def get_all_foods(self) -> dict:
+        """ Retourne la nourriture par case occupée (case -> liste des nourritures)
+        """
+        return {pos: [food] for pos, food in self.foods.items()}
+
     def is_pos_in_map(self, pos: tuple) -> bool:
-        if 0<=pos[0]<=Config.width_map-1 and 0<=pos[1]<=Config.height_map-1:
+        if 0<=pos[0]<=self.config.width_map-1 and 0<=pos[1]<=self.config.height_map-1:
             return True
         return False
-    
+
     def destroy_all_foods(self):
-        for coord, foods in self.get_all_foods().items():
-            for food in foods:
-                self.destroy_object(food, coord)
+        for food in self.foods.values():
+            del self.positions[food]
+        self.foods.clear()
+        if self.check_consistency: self.check_index()
 
     def create_bob(self, pos: tuple, stats=None):
-        if stats == None: bob = logic.bob.Bob()
-        else: bob = logic.bob.Bob(*stats)
-        self.map[pos].append(bob)
-    
+        if stats == None: bob = logic.bob.Bob(config=self.config)
+        else: bob = logic.bob.Bob(*stats, config=self.config)
+        self.add_object(bob, pos)
+        return bob
+
+    def load_bobs(self, bobs: list, cells: list, order: list):
+        """ Remplit une grille vide avec des bobs restaurés d'une sauvegarde
+
+        Args:
+            bobs (list): les bobs dans l'ordre du registre
+            cells (list): la case de chacun
+            order (list): indices des bobs dans l'ordre où les ajouter aux listes des cases
+        """
+        self.registry = dict.fromkeys(bobs)
+        self.positions.update(zip(bobs, cells))
+        for cell, bob in zip(map(cells.__getitem__, order), map(bobs.__getitem__, order)):
+            if cell in self.bobs: self.bobs[cell].append(bob)
+            else: self.bobs[cell] = [bob]
+        if self.check_consistency: self.check_index()
+
+    def load_foods(self, cells, energies):
+        """ Remplit une grille sans nourriture avec les énergies de nourriture des cases cells (sauvegarde)
+        """
+        self.foods = dict(zip(cells, map(logic.food.Food, energies)))
+        self.positions.update(zip(self.foods.values(), self.foods.keys()))
+        if self.check_consistency: self.check_index()
+
     def place_child(self, bob, pos: tuple):
         if self.is_pos_in_map(new_pos :=(pos[0]+1,pos[1])):
-            self.map[new_pos].append(bob)
-        else: self.map[(pos[0]-1, pos[1])].append(bob)
-        
-    def bobs_in_case(self, coord: tuple) -> list:
-        if coord in self.map:
-            return [i for i in self.map[coord] if isinstance(i, logic.bob.Bob)]
-        else:
-            return []  # or handle the case when coord is not in self.map
+            self.add_object(bob, new_pos)
+        else: self.add_object(bob, (pos[0]-1, pos[1]))
 
+    def bobs_in_case(self, coord: tuple) -> list:
+        """ Retourne les bobs de la case (liste de la grille, à ne pas modifier), une liste vide s'il n'y en a pas
+        """
+        return self.bobs.get(coord, [])
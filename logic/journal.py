@@ -0,0 +1,212 @@
+import json
+import numpy as np
+from logic.bob import Bob
+from logic.metrics import NpyAppender
+from logic.snapshot import RenderSnapshot, SnapshotBuffer
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Journal des événements d'une partie, pour la revoir sans la recalculer (python replay.py journal/).
+
+    EventJournal, branché sur un Game, ajoute chaque jour ses événements (déplacement, repas, naissance, attaque,
+    mort, nourriture apparue) à un dossier de fichiers .npy complétés au fil de la partie :
+
+        events.npy           un enregistrement EVENT_DTYPE par événement, dans l'ordre de la partie
+        days.npy             pour chaque jour : numéro, premier et dernier (exclu) événement
+        keyframes.npy        pour chaque image clé : jour, tranche de keyframe_bobs.npy puis de keyframe_foods.npy
+        keyframe_bobs.npy    état complet des bobs aux images clés (BOB_DTYPE, dans l'ordre du registre)
+        keyframe_foods.npy   nourriture aux images clés (FOOD_DTYPE)
+        header.json          paramètres de la partie
+
+    Les bobs y sont désignés par un identifiant donné à leur apparition. La population initiale est dans
+    l'image clé du premier jour, puis une image clé est ajoutée tous les journal_keyframe_days jours :
+    Replay.seek(jour) part de la dernière image clé et n'applique que les événements des jours suivants.
+"""
+
+# types d'événements
+MOVE, EAT, BIRTH, KILL, DEATH, FOOD = range(6)
+# causes de DEATH
+STARVATION, BORDER = range(2)
+
+# bob : acteur de l'événement, other : enfant (BIRTH) ou victime (KILL), x / y : case ou déplacement,
+# value : énergie du bob après l'événement (énergie de l'enfant pour BIRTH, de la nourriture pour FOOD),
+# value2 : énergie restante de la nourriture (EAT) ou de la mère (BIRTH)
+EVENT_DTYPE = np.dtype([("type", "u1"), ("bob", "<i4"), ("other", "<i4"), ("x", "<i4"), ("y", "<i4"),
+                        ("value", "<f8"), ("value2", "<f8")])
+BOB_DTYPE = np.dtype([("id", "<i4"), ("x", "<i4"), ("y", "<i4"), ("E", "<f8"), ("move_x", "<i4"), ("move_y", "<i4")])
+FOOD_DTYPE = np.dtype([("x", "<i4"), ("y", "<i4"), ("energy", "<f8")])
+
+FILES = ("events", "days", "keyframes", "keyframe_bobs", "keyframe_foods")
+
+
+class EventJournal():
+    """ Enregistreur branché sur un Game (attribut journal), appelé à chaque événement
+    """
+    def __init__(self, directory: str, keyframe_days=journal_keyframe_days):
+        self.directory = directory
+        self.keyframe_days = keyframe_days
+        os.makedirs(directory, exist_ok=True)
+        self.files = {name: NpyAppender(os.path.join(directory, f"{name}.npy")) for name in FILES}
+        self.ids = {}       # bob -> identifiant
+        self.next_id = 0
+        self.events = []    # événements du jour en cours
+        self.nb_events = 0  # événements déjà écrits
+        self.nb_keyframe_bobs = 0
+        self.nb_keyframe_foods = 0
+
+    def start(self, game):
+        """ Branche le journal sur la partie et écrit l'en-tête et la première image clé (population de départ)
+        """
+        with open(os.path.join(self.directory, "header.json"), "w") as f:
+            json.dump({"width_map": game.config.width_map, "height_map": game.config.height_map,
+                       "nb_tick_day": game.config.nb_tick_day, "Emax": Bob.get_Emax(),
+                       "first_day": game.day, "keyframe_days": self.keyframe_days}, f, indent=1)
+        for bob in game.grid.registry:
+            self.new_id(bob)
+        self.write_keyframe(game)
+        game.journal = self
+
+    def new_id(self, bob) -> int:
+        self.ids[bob] = bob_id = self.next_id
+        self.next_id += 1
+        return bob_id
+
+    # --- Événements, appelés par Game ---
+
+    def move(self, bob, move: tuple):
+        self.events.append((MOVE, self.ids[bob], -1, move[0], move[1], bob.E, 0))
+
+    def eat(self, bob, pos: tuple, food):
+        self.events.append((EAT, self.ids[bob], -1, pos[0], pos[1], bob.E, food.energy))
+
+    def birth(self, mother, child, pos: tuple):
+        self.events.append((BIRTH, self.ids[mother], self.new_id(child), pos[0], pos[1], child.E, mother.E))
+
+    def kill(self, bob, target):
+        self.events.append((KILL, self.ids[bob], self.ids.pop(target), 0, 0, bob.E, 0))
+
+    def death(self, bob, cause: int):
+        self.events.append((DEATH, self.ids.pop(bob), -1, cause, 0, 0, 0))
+
+    def food(self, pos: tuple, energy):
+        self.events.append((FOOD, -1, -1, pos[0], pos[1], energy, 0))
+
+    def end_day(self, game):
+        """ Ajoute les événements du jour qui vient d'être joué, et une image clé tous les keyframe_days jours
+        """
+        events = np.array(self.events, dtype=EVENT_DTYPE)
+        self.events = []
+        self.files["events"].append(events)
+        self.files["days"].append(np.array([[game.day, self.nb_events, self.nb_events + len(events)]], dtype=np.int64))
+        self.nb_events += len(events)
+        if game.day % self.keyframe_days == 0:
+            self.write_keyframe(game)
+
+    def write_keyframe(self, game):
+        grid = game.grid
+        bobs = np.array([(self.ids[bob], *grid.positions[bob], bob.E, *bob.last_move) for bob in grid.registry],
+                        dtype=BOB_DTYPE)
+        foods = np.array([(*pos, food.energy) for pos, food in grid.foods.items()], dtype=FOOD_DTYPE)
+        self.files["keyframe_bobs"].append(bobs)
+        self.files["keyframe_foods"].append(foods)
+        self.files["keyframes"].append(np.array([[game.day, self.nb_keyframe_bobs, self.nb_keyframe_bobs + len(bobs),
+                                                  self.nb_keyframe_foods, self.nb_keyframe_foods + len(foods)]], dtype=np.int64))
+        self.nb_keyframe_bobs += len(bobs)
+        self.nb_keyframe_foods += len(foods)
+
+    def close(self):
+        for appender in self.files.values():
+            appender.close()
+
+
+class Replay():
+    """ Relecture d'un journal : état de l'affichage (positions, déplacement du jour, énergie, nourriture)
+        reconstruit jour par jour à partir des événements, sans moteur de simulation
+    """
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "header.json")) as f:
+            self.header = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in FILES}
+        self.events = arrays["events"]
+        self.days = arrays["days"]
+        self.keyframes = arrays["keyframes"]
+        self.keyframe_bobs = arrays["keyframe_bobs"]
+        self.keyframe_foods = arrays["keyframe_foods"]
+        self.render_buffer = SnapshotBuffer()
+        self.day = None
+        self.seek(self.first_day())
+
+    def first_day(self) -> int:
+        return int(self.keyframes[0, 0])
+
+    def last_day(self) -> int:
+        return int(self.days[-1, 0]) if len(self.days) else self.first_day()
+
+    def seek(self, day: int):
+        """ Se place à la fin du jour day : dernière image clé avant lui, puis événements des jours suivants
+        """
+        day = min(max(day, self.first_day()), self.last_day())
+        keyframe = self.keyframes[np.searchsorted(self.keyframes[:, 0], day, side="right") - 1]
+        key_day, bobs_start, bobs_end, foods_start, foods_end = keyframe.tolist()
+        bobs = self.keyframe_bobs[bobs_start:bobs_end]
+        # identifiant -> [x, y, E, déplacement x, déplacement y], dans l'ordre du registre de la partie
+        self.bobs = {bob_id: list(state) for bob_id, *state in bobs.tolist()}
+        foods = self.keyframe_foods[foods_start:foods_end]
+        self.foods = {(x, y): energy for x, y, energy in foods.tolist()}
+        self.day = key_day
+        while self.day < day:
+            self.next_day()
+
+    def next_day(self) -> bool:
+        """ Applique les événements du jour suivant, False s'il n'y en a plus
+        """
+        index = self.day - self.first_day()
+        if index >= len(self.days):
+            return False
+        day, start, end = self.days[index].tolist()
+        bobs, foods = self.bobs, self.foods
+        for state in bobs.values():
+            state[3] = state[4] = 0
+        food_spawned = False
+        for kind, bob, other, x, y, value, value2 in self.events[start:end].tolist():
+            if kind == MOVE:
+                state = bobs[bob]
+                state[0] += x
+                state[1] += y
+                state[2] = value
+                state[3] += x
+                state[4] += y
+            elif kind == EAT:
+                bobs[bob][2] = value
+                if value2 > 0: foods[(x, y)] = value2
+                else: foods.pop((x, y), None)
+            elif kind == BIRTH:
+                bobs[other] = [x, y, value, 0, 0]
+                bobs[bob][2] = value2
+            elif kind == KILL:
+                del bobs[other]
+                bobs[bob][2] = value
+            elif kind == DEATH:
+                del bobs[bob]
+            elif kind == FOOD:
+                # la nourriture restante est détruite en fin de jour, avant l'apparition de la nouvelle
+                if not food_spawned:
+                    foods.clear()
+                    food_spawned = True
+                foods[(x, y)] = foods.get((x, y), 0) + value
+        if not food_spawned:
+            foods.clear()
+        self.day = day
+        return True
+
+    def render_snapshot(self) -> RenderSnapshot:
+        """ Instantané d'affichage du jour courant, comme Game.render_snapshot
+        """
+        states = list(self.bobs.values())
+        positions = [state[:2] for state in states]
+        last_moves = [state[3:] for state in states]
+        energies = [state[2] for state in states]
+        self.render_buffer.back.write(positions, last_moves, energies, self.header["Emax"], list(self.foods))
+        return self.render_buffer.swap()
@@ -0,0 +1,166 @@
+import numpy as np
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Mesures de chaque jour pour l'étude de l'évolution : population, naissances, morts par cause,
+    nourriture mangée et histogrammes des caractéristiques des bobs.
+
+    Les compteurs sont tenus par la partie au fil des événements (DayMetrics) : rien n'est recompté sur la carte.
+    Les lignes de chaque jour passent ensuite par une chaîne de générateurs qui les regroupe par lots bornés
+    et les ajoute à un dossier de colonnes .npy (une par mesure), lisible à tout moment par np.load :
+
+        python -m logic.run --days 1000 --metrics mesures/
+        np.load("mesures/births.npy"), np.load("mesures/speed_hist.npy")
+"""
+
+# caractéristiques des bobs dont on suit la distribution
+TRAITS = ("speed", "mass", "memory", "perception")
+# histogrammes : TRAIT_BINS intervalles de largeur TRAIT_BIN_WIDTH à partir de 0, le dernier reçoit aussi tout ce qui dépasse
+TRAIT_BINS = 20
+TRAIT_BIN_WIDTH = 0.25
+# causes de mort : faim, attaque d'un autre bob, sortie de la carte
+DEATH_CAUSES = ("starvation", "attack", "border")
+
+# nombre de jours accumulés en mémoire avant d'être ajoutés aux fichiers
+METRICS_BATCH = 64
+# place laissée dans l'en-tête des fichiers .npy pour que leur nombre de lignes puisse grandir
+NPY_HEADER_SLACK = 32
+
+def trait_bin(value) -> int:
+    return min(int(value / TRAIT_BIN_WIDTH), TRAIT_BINS - 1)
+
+def trait_histogram(values: np.ndarray) -> np.ndarray:
+    bins = np.minimum((np.asarray(values) / TRAIT_BIN_WIDTH).astype(np.int64), TRAIT_BINS - 1)
+    return np.bincount(bins, minlength=TRAIT_BINS)
+
+
+class DayMetrics():
+    """ Compteurs du jour en cours et histogrammes de la population vivante, tenus par la partie
+    """
+    def __init__(self):
+        self.histograms = np.zeros((len(TRAITS), TRAIT_BINS), dtype=np.int64)
+        self.start_day()
+
+    def start_day(self):
+        self.births = 0
+        self.deaths = dict.fromkeys(DEATH_CAUSES, 0)
+        self.food_eaten = 0.0
+
+    def add_bob(self, bob):
+        """ Un bob rejoint la population (population initiale ou naissance)
+        """
+        histograms = self.histograms
+        histograms[0, trait_bin(bob.speed)] += 1
+        histograms[1, trait_bin(bob.mass)] += 1
+        histograms[2, trait_bin(bob.memory)] += 1
+        histograms[3, trait_bin(bob.perception)] += 1
+
+    def remove_bob(self, bob):
+        histograms = self.histograms
+        histograms[0, trait_bin(bob.speed)] -= 1
+        histograms[1, trait_bin(bob.mass)] -= 1
+        histograms[2, trait_bin(bob.memory)] -= 1
+        histograms[3, trait_bin(bob.perception)] -= 1
+
+    def birth(self, bob):
+        self.births += 1
+        self.add_bob(bob)
+
+    def death(self, bob, cause: str):
+        self.deaths[cause] += 1
+        self.remove_bob(bob)
+
+    def eat(self, energy):
+        self.food_eaten += energy
+
+    def count_population(self, traits: dict):
+        """ Recalcule les histogrammes d'une population entière (trait -> tableau des valeurs) :
+            au chargement d'une sauvegarde, ou à chaque jour pour le moteur vectoriel
+        """
+        for i, trait in enumerate(TRAITS):
+            self.histograms[i] = trait_histogram(traits[trait])
+
+    def row(self, day: int, bobs: int) -> dict:
+        """ Mesures du dernier jour joué
+        """
+        return {"day": day, "bobs": bobs, "births": self.births,
+                **{f"deaths_{cause}": count for cause, count in self.deaths.items()},
+                "food_eaten": self.food_eaten,
+                **{f"{trait}_hist": self.histograms[i].copy() for i, trait in enumerate(TRAITS)}}
+
+
+# --- Chaîne de générateurs : lignes des jours -> lots -> fichiers ---
+
+def batched(rows, size=METRICS_BATCH):
+    """ Regroupe les lignes par lots d'au plus size jours, en colonnes (nom -> tableau)
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield columns(batch)
+            batch = []
+    if batch:
+        yield columns(batch)
+
+def columns(rows: list) -> dict:
+    return {name: np.array([row[name] for row in rows]) for name in rows[0]}
+
+
+class NpyAppender():
+    """ Fichier .npy auquel on ajoute des lignes : les données sont écrites à la fin puis l'en-tête, de taille
+        fixe, est réécrit avec le nouveau nombre de lignes. Le fichier reste lisible par np.load après chaque ajout
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.dtype = None
+        self.row_shape = None
+        self.length = 0
+        self.header_size = 0
+        self.file = open(path, "wb")
+
+    def header(self) -> bytes:
+        shape = (self.length, *self.row_shape)
+        text = repr({"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False, "shape": shape})
+        # en-tête au format 1.0 : magique (8 octets), longueur (2 octets), dictionnaire complété par des espaces
+        # jusqu'au saut de ligne final, de taille fixée au premier ajout (multiple de 64)
+        if not self.header_size:
+            self.header_size = -(-(10 + len(text) + NPY_HEADER_SLACK + 1) // 64) * 64
+        text = text.ljust(self.header_size - 10 - 1) + "\n"
+        return np.lib.format.magic(1, 0) + len(text).to_bytes(2, "little") + text.encode("latin1")
+
+    def append(self, values: np.ndarray):
+        if self.dtype is None:
+            self.dtype, self.row_shape = values.dtype, values.shape[1:]
+            self.file.write(self.header())
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(values.tobytes())
+        self.length += len(values)
+        self.file.seek(0)
+        self.file.write(self.header())
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def write_metrics(batches, directory: str) -> int:
+    """ Ajoute chaque lot de colonnes à directory/<mesure>.npy, retourne le nombre de jours écrits
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    days = 0
+    try:
+        for batch in batches:
+            for name, values in batch.items():
+                if name not in files:
+                    files[name] = NpyAppender(os.path.join(directory, f"{name}.npy"))
+                files[name].append(values)
+            days += len(batch["day"])
+    finally:
+        for appender in files.values():
+            appender.close()
+    return days
@@ -0,0 +1,134 @@
+import argparse
+import json
+import numpy as np
+from logic.game import create_game
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Vérification de non-régression : pour une graine fixée, une optimisation du moteur doit redonner exactement
+    la même trajectoire de population que le moteur de référence.
+
+        python -m logic.regression record reference.json --seed 1 --days 50
+        python -m logic.regression check reference.json
+        python -m logic.regression compare --engine-a object --engine-b vector --seeds 10 --days 50
+
+    record enregistre la trajectoire du moteur actuel (avant optimisation), check rejoue la même configuration
+    et signale le premier jour qui diffère. Deux moteurs différents (logic.vector_engine) ne font pas les mêmes
+    tirages aléatoires ni les mêmes événements dans le même ordre : compare vérifie seulement que, en moyenne sur
+    plusieurs graines, leurs statistiques de chaque jour (population, nourriture, caractéristiques moyennes)
+    restent à moins de --tolerance l'une de l'autre.
+"""
+
+# paramètres de Config enregistrés avec la trajectoire de référence
+TRAJECTORY_PARAMETERS = (
+    "width_map", "height_map", "quantity_food", "energy_food", "nb_tick_day", "P0",
+    "bob_speed", "bob_mass", "bob_memory", "bob_perception", "mutation_rate",
+)
+
+def trajectory(engine: str, config, seed: int, days: int) -> list:
+    """ État de la population chaque jour (jour 0 compris) : nombre de bobs, de cases de nourriture
+        et énergie totale arrondie, pour une partie jouée avec la graine seed
+    """
+    game = create_game(engine, config, seed)
+    states = []
+    for day in range(days + 1):
+        if day: game.day_play()
+        stats = game.get_stats()
+        states.append([stats["bobs"], stats["foods"], round(stats["mean_energy"] * stats["bobs"], 6)])
+    return states
+
+# statistiques comparées jour par jour entre deux moteurs (Game.get_stats)
+ENVELOPE_STATS = ("bobs", "foods", "mean_energy", "mean_speed", "mean_mass")
+# écart relatif toléré entre les moyennes des deux moteurs
+ENVELOPE_TOLERANCE = 0.1
+
+def stats_runs(engine: str, config, seeds, days: int) -> np.ndarray:
+    """ Statistiques ENVELOPE_STATS de chaque jour (jour 0 compris) pour chaque graine : tableau graines x jours x stats
+    """
+    runs = []
+    for seed in seeds:
+        game = create_game(engine, config, seed)
+        rows = []
+        for day in range(days + 1):
+            if day: game.day_play()
+            stats = game.get_stats()
+            rows.append([stats[name] for name in ENVELOPE_STATS])
+        runs.append(rows)
+    return np.array(runs, dtype=float)
+
+def compare_envelopes(name_a: str, runs_a: np.ndarray, name_b: str, runs_b: np.ndarray, tolerance=ENVELOPE_TOLERANCE) -> bool:
+    """ Compare jour par jour les moyennes sur les graines des deux moteurs : l'écart relatif (par rapport à la
+        plus grande des deux) doit rester sous tolerance. Affiche l'écart maximal de chaque statistique
+    """
+    mean_a, mean_b = runs_a.mean(axis=0), runs_b.mean(axis=0)
+    gap = np.abs(mean_a - mean_b) / np.maximum(np.maximum(np.abs(mean_a), np.abs(mean_b)), 1e-12)
+    ok = True
+    for i, name in enumerate(ENVELOPE_STATS):
+        day = int(gap[:, i].argmax())
+        within = gap[day, i] <= tolerance
+        ok &= within
+        print(f"{name:<12} écart max {gap[day, i]:6.1%} au jour {day} ({name_a} {mean_a[day, i]:.4g}"
+              f" / {name_b} {mean_b[day, i]:.4g}){'' if within else '  HORS TOLÉRANCE'}")
+    print(f"{'moyennes compatibles' if ok else 'moyennes incompatibles'} sur {len(runs_a)} graines"
+          f" et {runs_a.shape[1] - 1} jours (tolérance {tolerance:.0%})")
+    return ok
+
+def first_divergence(reference: list, candidate: list):
+    """ Premier jour où les trajectoires diffèrent, None si elles sont identiques
+    """
+    for day, (expected, actual) in enumerate(zip(reference, candidate)):
+        if expected != actual:
+            return day
+    if len(reference) != len(candidate):
+        return min(len(reference), len(candidate))
+    return None
+
+def report(name_a: str, states_a: list, name_b: str, states_b: list) -> bool:
+    day = first_divergence(states_a, states_b)
+    if day is None:
+        print(f"trajectoires identiques sur {len(states_a) - 1} jours")
+        return True
+    print(f"divergence au jour {day} : {name_a} {states_a[day] if day < len(states_a) else None}"
+          f" / {name_b} {states_b[day] if day < len(states_b) else None}")
+    return False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m logic.regression", description="Non-régression des moteurs")
+    parser.add_argument("action", choices=("record", "check", "compare"))
+    parser.add_argument("reference", nargs="?", default="reference.json", help="fichier de trajectoire de référence")
+    parser.add_argument("--seed", type=int, default=1, help="graine (record) ou première graine (compare)")
+    parser.add_argument("--seeds", type=int, default=10, help="nombre de graines par moteur (compare)")
+    parser.add_argument("--tolerance", type=float, default=ENVELOPE_TOLERANCE, help="écart relatif toléré (compare)")
+    parser.add_argument("--days", type=int, default=50)
+    parser.add_argument("--engine", default="object", help="moteur enregistré (record) ou vérifié (check)")
+    parser.add_argument("--engine-a", default="object")
+    parser.add_argument("--engine-b", default="vector")
+    args = parser.parse_args(argv)
+
+    if args.action == "record":
+        states = trajectory(args.engine, Config, args.seed, args.days)
+        with open(args.reference, "w") as f:
+            json.dump({"engine": args.engine, "seed": args.seed, "days": args.days,
+                       "config": {name: getattr(Config, name) for name in TRAJECTORY_PARAMETERS},
+                       "trajectory": states}, f)
+        print(f"{args.days} jours enregistrés dans {args.reference}")
+        return
+
+    if args.action == "check":
+        with open(args.reference) as f:
+            reference = json.load(f)
+        config = Config()
+        load_config(reference["config"], config)
+        states = trajectory(args.engine, config, reference["seed"], reference["days"])
+        ok = report(f"référence ({reference['engine']})", reference["trajectory"], args.engine, states)
+    else:
+        seeds = range(args.seed, args.seed + args.seeds)
+        runs_a = stats_runs(args.engine_a, Config, seeds, args.days)
+        runs_b = stats_runs(args.engine_b, Config, seeds, args.days)
+        ok = compare_envelopes(args.engine_a, runs_a, args.engine_b, runs_b, args.tolerance)
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
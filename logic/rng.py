@@ -0,0 +1,41 @@
+import numpy as np
+
+"""
+    Générateur aléatoire propre à une partie : un numpy Generator initialisé par une graine, dont les tirages
+    sont faits par blocs et servis un par un. Il expose les fonctions du module random utilisées par la logique
+    (randint, uniform, choice) et peut donc être passé partout où le module random l'était.
+"""
+
+class BatchedRandom():
+    def __init__(self, seed=None, block_size=4096):
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+        self._buffer = []
+
+    def random(self) -> float:
+        """ Flottant uniforme dans [0, 1)
+        """
+        if not self._buffer:
+            # tirage d'un bloc, inversé pour servir les valeurs dans l'ordre avec pop()
+            self._buffer = self.generator.random(self.block_size).tolist()[::-1]
+        return self._buffer.pop()
+
+    def randint(self, a: int, b: int) -> int:
+        """ Entier uniforme dans [a, b], bornes incluses comme random.randint
+        """
+        return a + int(self.random() * (b - a + 1))
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def get_state(self) -> dict:
+        """ État complet (générateur et valeurs déjà tirées mais pas encore servies), pour les sauvegardes
+        """
+        return {"bit_generator": self.generator.bit_generator.state, "buffer": list(self._buffer)}
+
+    def set_state(self, state: dict):
+        self.generator.bit_generator.state = state["bit_generator"]
+        self._buffer = list(state["buffer"])
@@ -0,0 +1,111 @@
+import argparse
+import csv
+import time
+from logic.game import create_game
+from logic.checkpoint import load_game, save_game
+from logic.autosave import Autosaver, latest_autosave
+from logic.metrics import batched, write_metrics
+from logic.journal import EventJournal
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+from profiler import PROFILER, CPROFILE_PATTERN, play_day
+
+"""
+    Lancement d'une simulation sans affichage (ni pygame, ni pygame_menu, ni shapely) :
+
+        python -m logic.run --days 100 --P0 500 --config parametres.ini --output stats.csv
+
+    Chaque jour est calculé aussi vite que possible et ses statistiques sont écrites en CSV.
+"""
+
+# paramètres de Config modifiables en ligne de commande
+SIMULATION_PARAMETERS = (
+    "width_map", "height_map", "quantity_food", "energy_food", "nb_tick_day", "P0",
+    "bob_speed", "bob_mass", "bob_memory", "bob_perception", "mutation_rate", "engine",
+)
+
+STATS_FIELDS = ("day", "bobs", "foods", "mean_energy", "mean_speed", "mean_mass", "day_time")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m logic.run", description="Simulation sans affichage")
+    parser.add_argument("--days", type=int, default=100, help="nombre de jours à simuler")
+    parser.add_argument("--config", help="fichier INI avec une section [Config]")
+    parser.add_argument("--output", help="fichier CSV des statistiques (sortie standard par défaut)")
+    parser.add_argument("--seed", type=int, help="graine du générateur aléatoire (partie reproductible)")
+    parser.add_argument("--load", help="reprend la partie sauvegardée dans ce fichier (ses paramètres remplacent les options)")
+    parser.add_argument("--save", help="sauvegarde la partie dans ce fichier à la fin de la simulation")
+    parser.add_argument("--autosave", type=int, default=0, help=f"sauvegarde automatique tous les N jours dans {autosave_path}")
+    parser.add_argument("--resume", action="store_true", help="reprend la plus récente des sauvegardes automatiques")
+    parser.add_argument("--metrics", help="dossier des mesures détaillées de chaque jour (colonnes .npy, logic.metrics)")
+    parser.add_argument("--profile", help="fichier CSV des percentiles de durée des phases de chaque jour (profiler.py)")
+    parser.add_argument("--cprofile-day", type=int, help=f"enregistre ce jour avec cProfile dans {CPROFILE_PATTERN}")
+    parser.add_argument("--journal", help="dossier du journal des événements, pour revoir la partie avec python replay.py")
+    for name in SIMULATION_PARAMETERS:
+        parser.add_argument(f"--{name}", type=lambda text, name=name: parse_value(name, text), help=f"Config.{name} (défaut {getattr(Config, name)})")
+    return parser
+
+def configure(args):
+    """ Applique le fichier de configuration puis les options, qui sont prioritaires
+    """
+    if args.config:
+        load_config_file(args.config)
+    load_config({name: getattr(args, name) for name in SIMULATION_PARAMETERS if getattr(args, name) is not None})
+    if args.cprofile_day is not None:
+        Config.cprofile_day = args.cprofile_day
+
+def run_days(game, days: int, autosaver=None):
+    """ Générateur des statistiques de chaque jour : le premier est l'état initial (jour 0, ou celui de la sauvegarde)
+    """
+    yield {"day": game.day, **game.get_stats(), "day_time": 0}
+    for _ in range(days):
+        start = time.perf_counter()
+        play_day(game)
+        day_time = time.perf_counter() - start
+        if autosaver: autosaver.after_day(game)
+        yield {"day": game.day, **game.get_stats(), "day_time": day_time}
+
+def write_stats(rows, writer, game):
+    """ Écrit les statistiques de chaque jour et produit les mesures détaillées (logic.metrics) des jours joués
+    """
+    for i, stats in enumerate(rows):
+        writer.writerow(stats)
+        if i: yield game.metrics.row(game.day, game.count_bobs())
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure(args)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(output, fieldnames=STATS_FIELDS)
+        writer.writeheader()
+        start = time.perf_counter()
+        load_path = latest_autosave() if args.resume else args.load
+        game = load_game(load_path) if load_path else create_game(seed=args.seed)
+        autosaver = Autosaver(args.autosave)
+        if args.profile: PROFILER.enable(packages=("logic",))
+        journal = None
+        if args.journal:
+            if game.config.engine != "object":
+                raise SystemExit("--journal : seul le moteur \"object\" tient un journal des événements")
+            journal = EventJournal(args.journal)
+            journal.start(game)
+        metrics = write_stats(run_days(game, args.days, autosaver), writer, game)
+        if args.metrics:
+            write_metrics(batched(metrics), args.metrics)
+        else:
+            for _ in metrics: pass
+        autosaver.close()
+        if journal: journal.close()
+        if args.profile:
+            PROFILER.disable()
+            PROFILER.export(args.profile)
+        total = time.perf_counter() - start
+        if args.save: save_game(game, args.save)
+    finally:
+        if output is not sys.stdout: output.close()
+    print(f"{args.days} jours en {total:.2f} s ({args.days / total:.1f} jours/s)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
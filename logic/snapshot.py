@@ -0,0 +1,99 @@
+import numpy as np
+
+"""
+    Instantané compact de l'état du jeu pour l'affichage : seulement ce que lit graphic.interface.Interface
+    (positions et last_move des bobs, tranche d'énergie pour le halo, cases de nourriture).
+    Les tableaux sont préalloués et réutilisés d'un jour à l'autre ; deux instantanés alternent
+    entre la logique (qui remplit) et l'affichage (qui lit).
+"""
+
+# nombre de tranches d'énergie du halo : <=20%, <=40%, <=60%, <=80%, >80%
+NB_ENERGY_BUCKETS = 5
+
+def energy_bucket(E, Emax) -> np.ndarray:
+    """ Tranche d'énergie (0 à 4) de chaque bob, même découpage que Interface.choose_bob_border
+    """
+    return np.clip(np.ceil(np.asarray(E, dtype=float) / Emax * NB_ENERGY_BUCKETS) - 1, 0, NB_ENERGY_BUCKETS - 1)
+
+
+class RenderSnapshot():
+    def __init__(self, capacity_bobs=1024, capacity_foods=1024):
+        self.nb_bobs = 0
+        self.nb_foods = 0
+        self._bobs_pos = np.zeros((capacity_bobs, 2), dtype=np.int32)
+        self._bobs_last_move = np.zeros((capacity_bobs, 2), dtype=np.int32)
+        self._bobs_energy = np.zeros(capacity_bobs, dtype=np.uint8)
+        self._foods_pos = np.zeros((capacity_foods, 2), dtype=np.int32)
+        self._set_writeable(False)
+
+    """ Getters : vues en lecture seule sur la partie remplie des tableaux """
+    def get_bobs_pos(self) -> np.ndarray:
+        return self._bobs_pos[:self.nb_bobs]
+    def get_bobs_last_move(self) -> np.ndarray:
+        return self._bobs_last_move[:self.nb_bobs]
+    def get_bobs_energy(self) -> np.ndarray:
+        return self._bobs_energy[:self.nb_bobs]
+    def get_foods_pos(self) -> np.ndarray:
+        return self._foods_pos[:self.nb_foods]
+
+    def copy(self):
+        """ Copie compacte (tableaux ajustés à la partie remplie), par exemple pour l'envoyer à un autre processus
+        """
+        snapshot = RenderSnapshot(0, 0)
+        snapshot.nb_bobs, snapshot.nb_foods = self.nb_bobs, self.nb_foods
+        snapshot._bobs_pos = self.get_bobs_pos().copy()
+        snapshot._bobs_last_move = self.get_bobs_last_move().copy()
+        snapshot._bobs_energy = self.get_bobs_energy().copy()
+        snapshot._foods_pos = self.get_foods_pos().copy()
+        snapshot._set_writeable(False)
+        return snapshot
+
+    def _set_writeable(self, writeable: bool):
+        for array in (self._bobs_pos, self._bobs_last_move, self._bobs_energy, self._foods_pos):
+            array.flags.writeable = writeable
+
+    def reserve(self, nb_bobs: int, nb_foods: int):
+        """ Agrandit les tableaux (en doublant leur taille) s'ils sont trop petits
+        """
+        if nb_bobs > len(self._bobs_energy):
+            capacity = max(nb_bobs, 2 * len(self._bobs_energy))
+            self._bobs_pos = np.zeros((capacity, 2), dtype=np.int32)
+            self._bobs_last_move = np.zeros((capacity, 2), dtype=np.int32)
+            self._bobs_energy = np.zeros(capacity, dtype=np.uint8)
+        if nb_foods > len(self._foods_pos):
+            self._foods_pos = np.zeros((max(nb_foods, 2 * len(self._foods_pos)), 2), dtype=np.int32)
+
+    def write(self, bobs_pos, bobs_last_move, bobs_E, Emax, foods_pos):
+        """ Copie l'état du jour dans les tableaux préalloués
+
+        Args:
+            bobs_pos: positions (x, y) des bobs (séquence ou tableau N x 2)
+            bobs_last_move: déplacement du jour de chaque bob (N x 2)
+            bobs_E: énergie de chaque bob
+            Emax: énergie maximale d'un bob
+            foods_pos: cases (x, y) contenant de la nourriture
+        """
+        self.nb_bobs, self.nb_foods = len(bobs_E), len(foods_pos)
+        self.reserve(self.nb_bobs, self.nb_foods)
+        self._set_writeable(True)
+        if self.nb_bobs:
+            self._bobs_pos[:self.nb_bobs] = bobs_pos
+            self._bobs_last_move[:self.nb_bobs] = bobs_last_move
+            self._bobs_energy[:self.nb_bobs] = energy_bucket(bobs_E, Emax)
+        if self.nb_foods:
+            self._foods_pos[:self.nb_foods] = foods_pos
+        self._set_writeable(False)
+
+
+class SnapshotBuffer():
+    """ Double tampon d'instantanés : la logique remplit l'arrière pendant que l'affichage lit l'avant
+    """
+    def __init__(self):
+        self.front = RenderSnapshot()
+        self.back = RenderSnapshot()
+
+    def swap(self) -> RenderSnapshot:
+        """ Échange les deux instantanés et retourne le nouvel avant (celui qui vient d'être rempli)
+        """
+        self.front, self.back = self.back, self.front
+        return self.front
@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from configparser import ConfigParser
+from logic.game import create_game
+from logic.checkpoint import GAME_PARAMETERS
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Balayage de paramètres : des parties indépendantes (une configuration propre à chacune, une graine par partie)
+    réparties sur un groupe de processus.
+
+        python -m logic.sweep balayage.ini --output resultats.jsonl --workers 8
+
+    [Config]    valeurs communes à toutes les parties
+    P0 = 200
+    [Sweep]     valeurs à croiser, séparées par des virgules
+    quantity_food = 100, 200, 400
+    bob_mass = 1, 1.5
+    [Runs]      nombre de graines par combinaison et de jours par partie
+    seeds = 10
+    days = 200
+
+    Chaque partie terminée est ajoutée immédiatement au fichier de résultats (une ligne JSON par partie).
+    Relancer la même commande reprend le balayage en sautant les parties déjà présentes dans ce fichier.
+    Une partie est identifiée par ses paramètres balayés, sa graine, son nombre de jours et une empreinte de
+    toute sa configuration (valeurs communes comprises) : changer [Config] ou days relance toutes les parties.
+"""
+
+def parse_values(name: str, text: str) -> list:
+    """ Convertit "v1, v2, ..." en liste de valeurs du paramètre name de Config
+    """
+    return [parse_value(name, value) for value in text.split(",")]
+
+def game_config(base: dict, params: dict) -> dict:
+    """ Paramètres de la partie (GAME_PARAMETERS) une fois les valeurs communes puis balayées appliquées
+    """
+    config = Config()
+    load_config(base, config)
+    load_config(params, config)
+    return {name: getattr(config, name) for name in GAME_PARAMETERS}
+
+def run_id(params: dict, seed: int, days: int, config: dict) -> str:
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+    return (",".join(f"{name}={value}" for name, value in sorted(params.items()))
+            + f",seed={seed},days={days},config={digest}")
+
+def build_runs(sweep: dict, seeds: int, days: int, base=None) -> list:
+    """ Produit cartésien des valeurs de sweep (nom -> liste de valeurs), répété pour chaque graine
+    """
+    names = sorted(sweep)
+    runs = []
+    for values in itertools.product(*(sweep[name] for name in names)):
+        params = dict(zip(names, values))
+        config = game_config(base or {}, params)
+        for seed in range(seeds):
+            runs.append({"run_id": run_id(params, seed, days, config), "params": params, "seed": seed, "days": days,
+                         "config": config})
+    return runs
+
+def load_completed(path: str) -> set:
+    """ Identifiants des parties déjà écrites dans le fichier de résultats (une ligne tronquée par un arrêt brutal est ignorée)
+    """
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path) as f:
+        for line in f:
+            try:
+                completed.add(json.loads(line)["run_id"])
+            except (ValueError, KeyError):
+                pass
+    return completed
+
+def run_one(base: dict, run: dict) -> dict:
+    """ Joue une partie dans le processus courant avec sa propre configuration et retourne son résultat
+    """
+    config = Config()
+    load_config(base, config)
+    load_config(run["params"], config)
+    start = time.perf_counter()
+    game = create_game(config=config, seed=run["seed"])
+    setup_time = time.perf_counter() - start
+    # seuls les jours joués comptent dans wall_time et ticks_per_sec, pas la création de la population
+    start = time.perf_counter()
+    population = [game.count_bobs()]
+    for _ in range(run["days"]):
+        game.day_play()
+        population.append(game.count_bobs())
+    wall_time = time.perf_counter() - start
+    return {
+        **run,
+        "engine": config.engine,
+        "population": population,
+        "final": game.get_stats(),
+        "setup_time": setup_time,
+        "wall_time": wall_time,
+        "ticks_per_sec": run["days"] * config.nb_tick_day / wall_time if wall_time else 0,
+    }
+
+def run_sweep(base: dict, runs: list, output: str, workers=None):
+    """ Lance les parties absentes du fichier output sur un groupe de processus et y ajoute chaque résultat dès sa fin
+    """
+    completed = load_completed(output)
+    pending = [run for run in runs if run["run_id"] not in completed]
+    print(f"{len(runs) - len(pending)} parties déjà faites, {len(pending)} à lancer", file=sys.stderr)
+    context = multiprocessing.get_context("spawn")
+    with open(output, "a") as f, ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(run_one, base, run) for run in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            print(f"[{done}/{len(pending)}] {result['run_id']} : {result['wall_time']:.2f} s, "
+                  f"{result['ticks_per_sec']:.0f} ticks/s", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m logic.sweep", description="Balayage de paramètres en parallèle")
+    parser.add_argument("file", nargs="?", help="fichier INI avec les sections [Config], [Sweep] et [Runs]")
+    parser.add_argument("--param", action="append", default=[], metavar="NOM=V1,V2", help="valeurs à croiser (répétable)")
+    parser.add_argument("--seeds", type=int, help="nombre de graines par combinaison")
+    parser.add_argument("--days", type=int, help="nombre de jours par partie")
+    parser.add_argument("--output", default="sweep.jsonl", help="fichier des résultats (JSON, une ligne par partie)")
+    parser.add_argument("--workers", type=int, help="nombre de processus (par défaut le nombre de coeurs)")
+    args = parser.parse_args(argv)
+
+    base, sweep, seeds, days = {}, {}, 1, 100
+    if args.file:
+        ini = ConfigParser()
+        ini.optionxform = str # conserve la casse des noms (P0)
+        if not ini.read(args.file):
+            raise FileNotFoundError(args.file)
+        if ini.has_section("Config"):
+            base = {name: parse_value(name, text) for name, text in ini["Config"].items()}
+        if ini.has_section("Sweep"):
+            sweep = {name: parse_values(name, text) for name, text in ini["Sweep"].items()}
+        if ini.has_section("Runs"):
+            seeds = ini["Runs"].getint("seeds", seeds)
+            days = ini["Runs"].getint("days", days)
+    for param in args.param:
+        name, _, text = param.partition("=")
+        sweep[name] = parse_values(name, text)
+    seeds = args.seeds or seeds
+    days = args.days or days
+
+    run_sweep(base, build_runs(sweep, seeds, days, base), args.output, args.workers)
+
+if __name__ == '__main__':
+    main()
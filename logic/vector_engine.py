@@ -0,0 +1,269 @@
+import numpy as np
+from logic.bob import Bob
+from logic.metrics import DayMetrics, TRAITS
+from logic.snapshot import RenderSnapshot, SnapshotBuffer
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+
+"""
+    Moteur de simulation vectoriel : les bobs sont stockés en colonnes (un tableau NumPy par
+    caractéristique) et la nourriture dans un tableau 2D width_map x height_map d'énergie.
+    Chaque tick applique reproduction / manger / déplacement / mort / attaque par lots.
+    Même contrat que logic.game.Game : day_play() et render_snapshot() pour l'affichage.
+
+    Les règles sont celles de logic.game.Game : reproduction à E == Emax exactement, nourriture cumulée par case
+    et partagée dans l'ordre des bobs, mort de faim à E <= 0, sortie de la carte, attaque du premier bob de la case
+    assez léger (masse < 2/3 de celle de l'attaquant). Le calcul par lots ne peut pas reproduire l'enchaînement
+    bob par bob de Game, d'où ces différences, qui ne changent que l'ordre des événements dans un tick :
+
+    - chaque étape est faite par tous les bobs avant la suivante : ceux qui mangent sur place mangent avant
+      ceux qui se déplacent, et un bob tué dans le tick a déjà mangé ou bougé avec les autres ;
+    - l'ordre dans une case est l'ordre des bobs (d'arrivée dans la partie), pas l'ordre d'arrivée dans la case ;
+    - les attaques sont résolues après tous les déplacements : si plusieurs attaquants visent la même cible,
+      le premier dans l'ordre des bobs l'emporte et les autres passent au bob suivant de la case ;
+    - les tirages aléatoires sont faits par tableaux : une même graine ne donne pas la même partie que Game.
+
+    Les deux moteurs se comparent donc statistiquement (python -m logic.regression compare), pas jour par jour.
+"""
+
+# colonnes des bobs, dans l'ordre des bobs
+BOB_FIELDS = ("x", "y", "E", "speed", "mass", "memory", "perception", "speed_buff", "last_move")
+
+class VectorGame():
+    def __init__(self, config=Config, seed=None, populate=True):
+        # configuration propre à la partie : la classe Config ou une instance (plusieurs parties isolées)
+        self.config = config
+        self.rng = np.random.default_rng(seed)
+        self.width = config.width_map
+        self.height = config.height_map
+        self.food = np.zeros((self.width, self.height))
+        self.render_buffer = SnapshotBuffer()
+        # nombre de jours joués depuis le début de la partie
+        self.day = 0
+        # mesures du jour (logic.metrics), comptées par lots à chaque tick
+        self.metrics = DayMetrics()
+        # populate=False : aucun bob, ils sont ensuite donnés par restore_state (chargement d'une sauvegarde)
+        if populate:
+            self.init_bobs()
+            self.spawn_food()
+            self.count_population()
+
+    def init_bobs(self):
+        """init bob
+            initialisation des P0 bobs dans exactement P0 places
+        """
+        P0 = self.config.P0
+        cells = self.rng.choice(self.width * self.height, size=P0, replace=False)
+        self.x = cells // self.height
+        self.y = cells % self.height
+        self.E = np.full(P0, Bob.get_Emax() // 2, dtype=float)
+        self.speed = np.full(P0, self.config.bob_speed, dtype=float)
+        self.mass = np.full(P0, self.config.bob_mass, dtype=float)
+        self.memory = np.full(P0, self.config.bob_memory, dtype=float)
+        self.perception = np.full(P0, self.config.bob_perception, dtype=float)
+        self.speed_buff = np.zeros(P0)
+        self.last_move = np.zeros((P0, 2), dtype=np.int64)
+
+    def count_bobs(self) -> int:
+        return len(self.E)
+
+    def count_population(self):
+        """ Histogrammes des caractéristiques, recalculés d'un bloc sur les colonnes
+        """
+        self.metrics.count_population({trait: getattr(self, trait) for trait in TRAITS})
+
+    def get_stats(self) -> dict:
+        """ Statistiques de la population courante (nombre de bobs, cases de nourriture, moyennes)
+        """
+        nb_bobs = len(self.E)
+        return {
+            "bobs": nb_bobs,
+            "foods": int(np.count_nonzero(self.food)),
+            "mean_energy": float(self.E.mean()) if nb_bobs else 0,
+            "mean_speed": float(self.speed.mean()) if nb_bobs else 0,
+            "mean_mass": float(self.mass.mean()) if nb_bobs else 0,
+        }
+
+    def spawn_food(self):
+        """generer la nouritures
+        """
+        xs = self.rng.integers(0, self.width, self.config.quantity_food)
+        ys = self.rng.integers(0, self.height, self.config.quantity_food)
+        np.add.at(self.food, (xs, ys), self.config.energy_food)
+
+    def destroy_all_foods(self):
+        self.food[:] = 0
+
+    def reset_bobs_last_move(self):
+        self.last_move[:] = 0
+
+    def share_food(self, idx, cells, cost) -> np.ndarray:
+        """ Répartit la nourriture des cases entre les bobs idx (dans l'ordre des bobs) comme le ferait
+            une suite d'appels à Bob.eat : chacun mange ce qu'il reste après les précédents de sa case.
+
+        Args:
+            idx (ndarray): indices des bobs qui mangent, croissants
+            cells (ndarray): case (x * height + y) de chacun de ces bobs
+            cost (float): énergie dépensée pour manger (0.5 dans Bob.eat, 0 après un déplacement)
+
+        Returns:
+            ndarray: masque booléen sur idx des bobs qui ont réellement trouvé de la nourriture
+        """
+        if len(idx) == 0:
+            return np.zeros(0, dtype=bool)
+        food = self.food.reshape(-1)
+        order = np.argsort(cells, kind="stable")
+        idx_s, cells_s = idx[order], cells[order]
+        demand = Bob.get_Emax() - (self.E[idx_s] - cost)
+        before = np.cumsum(demand) - demand
+        uniq, starts, counts = np.unique(cells_s, return_index=True, return_counts=True)
+        before -= np.repeat(before[starts], counts)
+        avail = food[cells_s] - before
+        ate_s = avail > 0
+        self.E[idx_s[ate_s]] += np.minimum(demand, avail)[ate_s] - cost
+        remaining = np.maximum(food[uniq] - np.add.reduceat(demand, starts), 0)
+        self.metrics.eat(float((food[uniq] - remaining).sum()))
+        food[uniq] = remaining
+        ate = np.empty_like(ate_s)
+        ate[order] = ate_s
+        return ate
+
+    def move(self, idx):
+        """ Déplace les bobs idx comme Bob.move et retourne le masque de ceux restés sur la carte
+        """
+        self.speed_buff[idx] += self.speed[idx]
+        steps = np.floor(self.speed_buff[idx])
+        self.speed_buff[idx] -= steps
+        steps = steps.astype(np.int64)
+        add_x = self.rng.integers(0, steps + 1) * (self.rng.integers(0, 2, len(idx)) * 2 - 1)
+        add_y = (steps - np.abs(add_x)) * (self.rng.integers(0, 2, len(idx)) * 2 - 1)
+        self.last_move[idx, 0] += add_x
+        self.last_move[idx, 1] += add_y
+        self.E[idx] -= 0.5 * self.mass[idx] * self.speed[idx] ** 2
+        new_x, new_y = self.x[idx] + add_x, self.y[idx] + add_y
+        in_map = (0 <= new_x) & (new_x < self.width) & (0 <= new_y) & (new_y < self.height)
+        self.x[idx] = np.where(in_map, new_x, self.x[idx])
+        self.y[idx] = np.where(in_map, new_y, self.y[idx])
+        return in_map
+
+    def attack(self, attackers, alive):
+        """ Chaque attaquant attaque le premier bob vivant de sa case (dans l'ordre des bobs) dont la masse est
+            inférieure aux 2/3 de la sienne (Bob.attack). Une cible ne meurt qu'une fois : le premier attaquant
+            l'emporte, les suivants continuent leur recherche dans la case
+        """
+        if len(attackers) == 0:
+            return
+        cells = self.x * self.height + self.y
+        living = np.flatnonzero(alive)
+        # bobs vivants par case, dans l'ordre des bobs à l'intérieur d'une case (tri stable)
+        order = living[np.argsort(cells[living], kind="stable")]
+        sorted_cells = cells[order]
+        candidate = np.searchsorted(sorted_cells, cells[attackers], side="left")
+        end = np.searchsorted(sorted_cells, cells[attackers], side="right")
+        # un passage par rang dans la case : au plus autant que de bobs dans la case la plus peuplée
+        while len(attackers):
+            searching = (candidate < end) & alive[attackers]
+            attackers, candidate, end = attackers[searching], candidate[searching], end[searching]
+            if len(attackers) == 0:
+                break
+            targets = order[candidate]
+            ok = np.flatnonzero(alive[targets] & (self.mass[targets] / self.mass[attackers] < 2 / 3))
+            targets, first = np.unique(targets[ok], return_index=True)
+            winners = ok[first]
+            E_t, E_a = self.E[targets], self.E[attackers[winners]]
+            self.E[attackers[winners]] += 0.5 * E_t * (1 - E_t / E_a)
+            alive[targets] = False
+            self.metrics.deaths["attack"] += len(targets)
+            done = np.zeros(len(attackers), dtype=bool)
+            done[winners] = True
+            attackers, candidate, end = attackers[~done], candidate[~done] + 1, end[~done]
+
+    def parthenogenesis(self, mothers) -> dict:
+        """ Les mères repassent à Emax - Emother et donnent chacune un enfant muté à côté d'elles
+        """
+        self.E[mothers] = Bob.get_Emax() - Bob.get_Emother()
+        n = len(mothers)
+        child = {}
+        for name, default in (("speed", self.config.bob_speed), ("mass", self.config.bob_mass),
+                              ("memory", self.config.bob_memory), ("perception", self.config.bob_perception)):
+            stat = getattr(self, name)[mothers] + self.rng.uniform(-self.config.mutation_rate, self.config.mutation_rate, n)
+            # comme Bob.apply_stats : une caractéristique nulle reprend la valeur par défaut
+            child[name] = np.where(stat <= 0, default, stat)
+        x = self.x[mothers]
+        child["x"] = np.where(x + 1 < self.width, x + 1, x - 1)
+        child["y"] = self.y[mothers].copy()
+        child["E"] = np.full(n, Bob.get_Echild(), dtype=float)
+        child["speed_buff"] = np.zeros(n)
+        child["last_move"] = np.zeros((n, 2), dtype=np.int64)
+        return child
+
+    def bobs_play_tick(self):
+        n = len(self.E)
+        alive = np.ones(n, dtype=bool)
+        cells = self.x * self.height + self.y
+
+        # comme Game.bob_play_tick : seul un bob exactement à Emax se reproduit
+        # (un bob au-delà, après une attaque, mange ou se déplace)
+        mothers = np.flatnonzero(self.E == Bob.get_Emax())
+        idle = self.E != Bob.get_Emax()
+
+        eaters = np.flatnonzero(idle & (self.food.reshape(-1)[cells] > 0))
+        ate = np.zeros(n, dtype=bool)
+        ate[eaters] = self.share_food(eaters, cells[eaters], 0.5)
+
+        movers = np.flatnonzero(idle & ~ate)
+        alive[movers] = self.move(movers)
+        self.metrics.deaths["border"] += len(movers) - int(alive[movers].sum())
+        movers = movers[alive[movers]]
+        cells = self.x * self.height + self.y
+        hungry = movers[self.food.reshape(-1)[cells[movers]] > 0]
+        self.share_food(hungry, cells[hungry], 0)
+        starving = movers[self.E[movers] <= 0]
+        alive[starving] = False
+        self.metrics.deaths["starvation"] += len(starving)
+        self.attack(movers[alive[movers]], alive)
+
+        mothers = mothers[alive[mothers]]
+        self.metrics.births += len(mothers)
+        child = self.parthenogenesis(mothers)
+        for name in BOB_FIELDS:
+            setattr(self, name, np.concatenate((getattr(self, name)[alive], child[name])))
+
+    def bobs_play_day(self):
+        for _ in range(self.config.nb_tick_day):
+            self.bobs_play_tick()
+
+    def day_play(self):
+        self.metrics.start_day()
+        self.reset_bobs_last_move()
+        self.bobs_play_day()
+        self.destroy_all_foods()
+        self.spawn_food()
+        self.day += 1
+        self.count_population()
+
+    def render_snapshot(self) -> RenderSnapshot:
+        """ Remplit l'instantané d'affichage arrière avec l'état courant puis l'échange avec l'avant
+        """
+        self.render_buffer.back.write(np.column_stack((self.x, self.y)), self.last_move, self.E,
+                                      Bob.get_Emax(), np.argwhere(self.food > 0))
+        return self.render_buffer.swap()
+
+    def checkpoint_state(self) -> tuple:
+        """ État complet de la partie pour une sauvegarde (logic.checkpoint) : valeurs simples et colonnes NumPy
+        """
+        arrays = {name: getattr(self, name) for name in BOB_FIELDS}
+        arrays["food"] = self.food
+        return {"day": self.day, "rng": self.rng.bit_generator.state}, arrays
+
+    def restore_state(self, values: dict, arrays: dict):
+        """ Remplace l'état de la partie par celui d'une sauvegarde (inverse de checkpoint_state)
+        """
+        self.day = values["day"]
+        self.rng.bit_generator.state = values["rng"]
+        # copies : les colonnes de la sauvegarde peuvent être des vues en lecture seule du fichier (mmap)
+        for name in BOB_FIELDS:
+            setattr(self, name, np.array(arrays[name]))
+        self.food = np.array(arrays["food"], dtype=float)
+        self.count_population()
@@ -0,0 +1,111 @@
+import multiprocessing
+import queue
+import time
+from logic.game import create_game
+from logic.checkpoint import load_game, save_game
+from logic.autosave import Autosaver
+from logic.snapshot import RenderSnapshot
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import *
+from profiler import play_day
+
+"""
+    Exécution de la logique dans un processus séparé : le Game vit dans le processus fils, qui calcule
+    les jours en avance et envoie l'instantané d'affichage de chaque jour dans une file bornée.
+    L'affichage n'est donc plus en concurrence avec la simulation pour le GIL.
+"""
+
+# délai (en secondes) entre deux vérifications de la demande d'arrêt quand la file est pleine
+STOP_POLL = 0.1
+# délai maximal (en secondes) laissé au processus de logique pour finir son jour et ses sauvegardes à l'arrêt
+STOP_TIMEOUT = 30
+
+class WorkerError(RuntimeError):
+    """ Le processus de logique s'est arrêté sans qu'on le lui demande (exception dans la partie ou au chargement)
+    """
+
+def run_logic(config: dict, snapshots, stop_event, save_event, load_path=None):
+    """ Boucle du processus de logique : instantané du jour courant puis calcul du jour suivant
+
+    Args:
+        config (dict): configuration du processus principal (config_to_dict)
+        snapshots (Queue): file bornée des instantanés à afficher
+        stop_event (Event): demande d'arrêt du processus principal
+        save_event (Event): demande de sauvegarde, faite à la fin du jour en cours
+        load_path (str): sauvegarde à reprendre plutôt qu'une nouvelle partie
+    """
+    load_config(config)
+    game = load_game(load_path) if load_path else create_game()
+    autosaver = Autosaver()
+    while not stop_event.is_set():
+        snapshot = game.render_snapshot().copy()
+        while not stop_event.is_set():
+            try:
+                snapshots.put(snapshot, timeout=STOP_POLL)
+                break
+            except queue.Full:
+                pass
+        play_day(game)
+        if save_event.is_set():
+            save_game(game)
+            save_event.clear()
+        autosaver.after_day(game)
+    # une sauvegarde demandée juste avant l'arrêt est faite quand même, l'écriture automatique en cours est attendue
+    if save_event.is_set():
+        save_game(game)
+        save_event.clear()
+    autosaver.close()
+
+
+class LogicWorker():
+    """ Processus de logique qui calcule jusqu'à days_ahead jours en avance sur l'affichage
+    """
+    def __init__(self, days_ahead=None, load_path=None):
+        context = multiprocessing.get_context("spawn")
+        self.snapshots = context.Queue(maxsize=days_ahead or Config.days_ahead)
+        self.stop_event = context.Event()
+        self.save_event = context.Event()
+        self.process = context.Process(target=run_logic,
+                                       args=(config_to_dict(), self.snapshots, self.stop_event, self.save_event, load_path),
+                                       daemon=True)
+
+    def start(self):
+        self.process.start()
+
+    def next_snapshot(self) -> RenderSnapshot:
+        """ Instantané du jour suivant, attend que le processus de logique l'ait calculé si besoin
+
+        Raises:
+            WorkerError: si le processus de logique s'est arrêté (sa trace d'erreur est affichée par multiprocessing)
+        """
+        while True:
+            try:
+                return self.snapshots.get(timeout=STOP_POLL)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise WorkerError(f"le processus de logique s'est arrêté (code de sortie {self.process.exitcode})")
+
+    def request_save(self):
+        """ Demande la sauvegarde de la partie (save_file). Elle est faite par le processus de logique à la fin
+            du jour qu'il calcule, qui peut avoir jusqu'à days_ahead jours d'avance sur l'affichage
+        """
+        self.save_event.set()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """ Arrête le processus de logique après son jour en cours et ses sauvegardes (demandée ou automatique).
+            Il n'est tué que s'il n'a pas fini au bout de timeout secondes
+        """
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        # la file est vidée pendant l'attente : le processus ne peut pas se terminer tant que
+        # ses derniers instantanés n'ont pas été lus
+        while self.process.is_alive() and time.monotonic() < deadline:
+            try:
+                while True:
+                    self.snapshots.get_nowait()
+            except queue.Empty:
+                pass
+            self.process.join(STOP_POLL)
+        if self.process.is_alive():
+            self.process.terminate()
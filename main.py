@@ -1,29 +1,62 @@
+import atexit
 import threading
-from copy import deepcopy
 
 from graphic.mainSurface import MainSurface
 from config import *
-from logic.game import Game
-
-# initialisation de la fenetre principale
-window = MainSurface()
-
-# boucle menu post jeu
-while not window.menu.game_is_on:
-    window.run_menu()
-
-# Initilisation de la logique
-window.start_game()
-game = Game()
-
-while True:
-    grid_copy = deepcopy(game.grid)
-
-    logic_thread = threading.Thread(target=game.day_play)
-
-    logic_thread.start()
-    
-    window.run(grid_copy)
-
-    logic_thread.join()
-
+from logic.game import create_game
+from logic.checkpoint import load_game_config
+from logic.worker import LogicWorker
+from logic.autosave import Autosaver
+from save import read_save, write_save
+from profiler import play_day
+
+# le processus de logique (mode "process") réimporte ce module : tout doit rester sous ce test
+if __name__ == '__main__':
+    # initialisation de la fenetre principale
+    window = MainSurface()
+
+    # boucle menu post jeu
+    while not window.menu.game_is_on:
+        window.run_menu()
+
+    if window.menu.load_path:
+        # dimensions et paramètres de la partie sauvegardée
+        window.current_day = load_game_config(window.menu.load_path)["day"]
+        window.menu.set_screen_size()
+
+    # Initilisation de la logique
+    window.start_game()
+
+    if Config.logic_mode == "process":
+        # la logique tourne dans son propre processus et calcule les jours en avance
+        worker = LogicWorker(load_path=window.menu.load_path)
+        worker.start()
+        # l'affichage quitte par sys.exit (EventController.quit, bouton Quitter) : le processus de logique
+        # doit alors finir son jour et une éventuelle sauvegarde demandée au lieu d'être tué avec lui
+        atexit.register(worker.stop)
+        while True:
+            window.run(worker.next_snapshot())
+            if window.menu.save_requested:
+                worker.request_save()
+                window.menu.save_requested = False
+
+    game = read_save(window.menu.load_path) if window.menu.load_path else create_game()
+    autosaver = Autosaver()
+
+    while True:
+        # instantané compact de l'état du jour, l'autre tampon sera rempli au jour suivant
+        snapshot = game.render_snapshot()
+
+        logic_thread = threading.Thread(target=play_day, args=(game,))
+
+        logic_thread.start()
+        
+        window.run(snapshot)
+
+        logic_thread.join()
+
+        if window.menu.save_requested:
+            # entre deux jours : l'état sauvegardé est celui du prochain jour affiché
+            write_save(game)
+            window.menu.save_requested = False
+        autosaver.after_day(game)
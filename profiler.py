@@ -0,0 +1,150 @@
+import cProfile
+import csv
+import functools
+import importlib
+import time
+from collections import deque
+import numpy as np
+from config import *
+
+"""
+    Mesure du temps passé dans les phases coûteuses de la logique et de l'affichage.
+
+    Les méthodes de HOOKS ne sont enveloppées par une mesure que pendant que le profilage est actif
+    (PROFILER.enable), le reste du temps ce sont les méthodes d'origine : aucun coût quand il est désactivé.
+    Pour chaque phase, les PROFILE_WINDOW dernières durées donnent des percentiles glissants, affichés
+    en jeu (F3 ou bouton Profilage) et exportés en CSV dans profile_file à la désactivation.
+"""
+
+# fichier des statistiques cProfile du jour Config.cprofile_day
+CPROFILE_PATTERN = "profile_day_{day}.prof"
+# nombre de mesures gardées par phase pour les percentiles
+PROFILE_WINDOW = 300
+PERCENTILES = (50, 95, 99)
+
+# (module, classe, méthode, phase) : une phase "a.b" est une étape de la phase "a"
+HOOKS = (
+    ("logic.game", "Game", "day_play", "day_play"),
+    ("logic.game", "Game", "reset_bobs_last_move", "day_play.reset_bobs_last_move"),
+    ("logic.game", "Game", "bobs_play_day", "day_play.bobs_play_day"),
+    ("logic.grid", "Grid", "destroy_all_foods", "day_play.destroy_all_foods"),
+    ("logic.game", "Game", "spawn_food", "day_play.spawn_food"),
+    ("logic.vector_engine", "VectorGame", "day_play", "day_play"),
+    ("logic.vector_engine", "VectorGame", "reset_bobs_last_move", "day_play.reset_bobs_last_move"),
+    ("logic.vector_engine", "VectorGame", "bobs_play_day", "day_play.bobs_play_day"),
+    ("logic.vector_engine", "VectorGame", "destroy_all_foods", "day_play.destroy_all_foods"),
+    ("logic.vector_engine", "VectorGame", "spawn_food", "day_play.spawn_food"),
+    ("graphic.interface", "Interface", "render_game", "render_game"),
+    ("graphic.interface", "Interface", "print_ground", "render_game.print_ground"),
+    ("graphic.interface", "Interface", "print_food", "render_game.print_food"),
+    ("graphic.interface", "Interface", "move_bobs", "render_game.move_bobs"),
+    ("graphic.interface", "Interface", "redraw_dirty_tiles", "render_game.redraw_dirty_tiles"),
+    ("graphic.viewportRenderer", "ViewportRenderer", "render_view", "render_view"),
+    ("graphic.viewportRenderer", "ViewportRenderer", "print_food", "render_view.print_food"),
+    ("graphic.viewportRenderer", "ViewportRenderer", "move_bobs", "render_view.move_bobs"),
+    ("graphic.groundChunks", "GroundChunks", "draw", "ground.draw"),
+    ("graphic.densityMap", "DensityMap", "draw", "density.draw"),
+    ("graphic.cameraController", "CameraController", "get_viewpoint", "get_viewpoint"),
+)
+
+class Profiler():
+    def __init__(self, window=PROFILE_WINDOW):
+        self.window = window
+        self.timings = {}     # phase -> dernières durées (en secondes)
+        self._originals = {}  # (classe, méthode) -> fonction d'origine, tant que le profilage est actif
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self, packages=("logic", "graphic")):
+        """ Enveloppe les méthodes de HOOKS des paquets donnés ("logic" seul sans affichage).
+            Les modules qui ne peuvent pas être importés (affichage sans pygame) sont ignorés
+        """
+        if self.enabled:
+            return
+        for module_name, class_name, method, phase in HOOKS:
+            if module_name.split(".")[0] not in packages:
+                continue
+            try:
+                cls = getattr(importlib.import_module(module_name), class_name)
+            except ImportError:
+                continue
+            function = cls.__dict__[method]
+            self._originals[(cls, method)] = function
+            setattr(cls, method, self.timed(function, phase))
+
+    def disable(self):
+        for (cls, method), function in self._originals.items():
+            setattr(cls, method, function)
+        self._originals.clear()
+
+    def toggle(self, path=None):
+        """ Active ou désactive le profilage ; à la désactivation, les mesures sont exportées dans path
+        """
+        if self.enabled:
+            self.disable()
+            if path: self.export(path)
+        else:
+            self.enable()
+
+    def timed(self, function, phase: str):
+        timings = self.timings.setdefault(phase, deque(maxlen=self.window))
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings.append(perf_counter() - start)
+        return wrapper
+
+    def percentiles(self) -> dict:
+        """ Phase -> nombre de mesures et percentiles glissants (en millisecondes), phases mesurées seulement
+        """
+        stats = {}
+        for phase, timings in sorted(self.timings.items()):
+            if not timings:
+                continue
+            values = np.percentile(np.array(timings) * 1000, PERCENTILES)
+            stats[phase] = {"count": len(timings), **{f"p{p}": value for p, value in zip(PERCENTILES, values.tolist())}}
+        return stats
+
+    def report(self) -> list:
+        """ Lignes de texte des percentiles, pour l'affichage en jeu
+        """
+        lines = [f"{'phase':<34}" + "".join(f"{f'p{p}':>9}" for p in PERCENTILES) + "  (ms)"]
+        for phase, stats in self.percentiles().items():
+            lines.append(f"{phase:<34}" + "".join(f"{stats[f'p{p}']:>9.2f}" for p in PERCENTILES))
+        return lines
+
+    def export(self, path=profile_file):
+        """ Écrit les percentiles de chaque phase en CSV
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["phase", "count", *(f"p{p}" for p in PERCENTILES)])
+            writer.writeheader()
+            for phase, stats in self.percentiles().items():
+                writer.writerow({"phase": phase, **stats})
+
+
+# profilage partagé par la logique et l'affichage
+PROFILER = Profiler()
+
+def profile_day(game, path: str):
+    """ Joue un jour sous cProfile et enregistre ses statistiques dans path (lisibles avec pstats ou snakeviz)
+    """
+    profile = cProfile.Profile()
+    profile.runcall(game.day_play)
+    profile.dump_stats(path)
+
+def play_day(game):
+    """ Joue le jour suivant de la partie, sous cProfile si c'est le jour Config.cprofile_day
+    """
+    day = game.day + 1
+    if Config.cprofile_day and day == Config.cprofile_day:
+        profile_day(game, CPROFILE_PATTERN.format(day=day))
+    else:
+        game.day_play()
@@ -0,0 +1,38 @@
+import argparse
+import pygame
+
+from graphic.mainSurface import MainSurface
+from config import *
+from logic.journal import Replay
+
+# nombre de jours sautés avec Page suivante / Page précédente
+SEEK_STEP = 100
+
+# revoit une partie enregistrée par python -m logic.run --journal, sans la recalculer
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python replay.py", description="Revoir une partie enregistrée dans un journal")
+    parser.add_argument("journal", help="dossier du journal (python -m logic.run --journal)")
+    parser.add_argument("--day", type=int, default=0, help="jour de départ")
+    args = parser.parse_args()
+
+    replay = Replay(args.journal)
+    load_config({"width_map": replay.header["width_map"], "height_map": replay.header["height_map"]})
+
+    window = MainSurface()
+    window.menu.set_screen_size()
+    window.menu.game_is_on = True
+    window.start_game()
+
+    replay.seek(args.day)
+    while True:
+        window.current_day = replay.day
+        window.run(replay.render_snapshot())
+
+        keystate = pygame.key.get_pressed()
+        if keystate[pygame.K_PAGEUP]:
+            replay.seek(replay.day + SEEK_STEP)
+        elif keystate[pygame.K_PAGEDOWN]:
+            replay.seek(replay.day - SEEK_STEP)
+        elif not replay.next_day():
+            # fin du journal : on reprend au début
+            replay.seek(replay.first_day())
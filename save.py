@@ -1,10 +1,12 @@
-import pickle
+from logic.checkpoint import save_game, load_game
+from config import *
 
-def write_save(game_state):
-    with open('data.pickle', 'wb') as f:
-        pickle.dump(game_state, f)
+def write_save(game, path=save_file):
+    """ Sauvegarde la partie en cours (format de logic.checkpoint)
+    """
+    save_game(game, path)
 
-def read_save():
-    with open('data.pickle', 'wb') as f:
-        game_state = pickle.load(f)
-    return game_state
+def read_save(path=save_file, config=Config):
+    """ Recrée la partie sauvegardée, après avoir appliqué ses paramètres à config
+    """
+    return load_game(path, config)
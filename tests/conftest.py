@@ -0,0 +1,15 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import pytest
+from config import *
+
+@pytest.fixture
+def small_config():
+    """ Fabrique de configurations isolées (instances de Config) pour une petite partie rapide,
+        les valeurs passées remplacent celles par défaut
+    """
+    def make(**values):
+        config = Config()
+        load_config({"width_map": 20, "height_map": 20, "P0": 60, "quantity_food": 80, "nb_tick_day": 4, **values}, config)
+        return config
+    return make
@@ -0,0 +1,35 @@
+import random
+import pytest
+from graphic.cameraController import rhombus_interval, path_fraction
+
+# losange de la map à l'écran : centre et demi-diagonales
+RHOMBUS = (400, 300, 350, 200)
+
+def inside(x, y, center_x, center_y, half_width, half_height):
+    return abs(x - center_x) / half_width + abs(y - center_y) / half_height < 1
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rhombus_interval_matches_sampling(seed):
+    rng = random.Random(seed)
+    x, y = rng.uniform(-200, 1000), rng.uniform(-200, 800)
+    dx, dy = rng.choice([(rng.uniform(-900, 900), 0), (0, rng.uniform(-900, 900)),
+                         (rng.uniform(-900, 900), rng.uniform(-900, 900))])
+    interval = rhombus_interval(x, y, dx, dy, *RHOMBUS)
+    for i in range(1001):
+        t = -1 + 3 * i / 1000
+        expected = inside(x + t*dx, y + t*dy, *RHOMBUS)
+        if interval is None:
+            assert not expected
+        elif abs(t - interval[0]) > 1e-9 and abs(t - interval[1]) > 1e-9:
+            assert expected == (interval[0] < t < interval[1])
+
+def test_rhombus_interval_without_move():
+    assert rhombus_interval(400, 300, 0, 0, *RHOMBUS) == (float("-inf"), float("inf"))
+    assert rhombus_interval(0, 0, 0, 0, *RHOMBUS) is None
+
+def test_path_fraction_needs_enough_corners():
+    intervals = [(-1, 0.5), (0.2, 0.8), None, (0.6, 2)]
+    assert path_fraction(intervals, 2, furthest=True) == 0.8
+    assert path_fraction(intervals, 2, furthest=False) == 0.2
+    assert path_fraction(intervals, 3, furthest=True) is None
+    assert path_fraction([(-1, 2), (-1, 2)], 2, furthest=True) == 1
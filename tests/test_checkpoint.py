@@ -0,0 +1,26 @@
+import pytest
+from logic.checkpoint import save_game, load_game, read_checkpoint, CheckpointError
+from logic.game import create_game
+from config import *
+
+@pytest.mark.parametrize("engine", ["object", "vector"])
+def test_save_load_continue_is_deterministic(engine, small_config, tmp_path):
+    game = create_game(engine, small_config(engine=engine), seed=11)
+    for _ in range(5):
+        game.day_play()
+    path = str(tmp_path / "partie.evo")
+    save_game(game, path)
+
+    loaded = load_game(path, Config())
+    assert loaded.day == game.day and loaded.get_stats() == game.get_stats()
+    for _ in range(5):
+        game.day_play()
+        loaded.day_play()
+        assert loaded.get_stats() == game.get_stats()
+    assert loaded.metrics.histograms.tolist() == game.metrics.histograms.tolist()
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "pas_une_sauvegarde.evo"
+    path.write_bytes(b"0" * 64)
+    with pytest.raises(CheckpointError):
+        read_checkpoint(str(path))
@@ -0,0 +1,66 @@
+from logic.bob import Bob
+from logic.food import Food
+from logic.game import Game
+from logic.grid import Grid
+
+def test_index_follows_add_move_destroy(small_config):
+    grid = Grid(small_config(), check_consistency=True)
+    a, b = grid.create_bob((1, 1)), grid.create_bob((1, 1))
+    grid.add_food((2, 2), 10)
+    grid.add_object(Food(5), (2, 2))
+    assert grid.get_position(a) == (1, 1) and grid.bobs_in_case((1, 1)) == [a, b]
+    assert grid.has_food((2, 2)).energy == 15
+
+    grid.move_object(a, (1, 1), (3, 4))
+    assert grid.get_position(a) == (3, 4) and grid.bobs_in_case((1, 1)) == [b]
+    grid.move_object(b, (1, 1), (3, 4))
+    assert (1, 1) not in grid.bobs and grid.bobs_in_case((3, 4)) == [a, b]
+
+    grid.destroy_object(a)
+    assert grid.get_position(a) is None and list(grid.registry) == [b]
+    grid.destroy_all_foods()
+    assert grid.foods == {} and list(grid.positions) == [b]
+
+def test_load_bobs_keeps_cell_order(small_config):
+    grid = Grid(small_config(), check_consistency=True)
+    bobs = [Bob.from_state(100, 1, 1, 0, 0, 0, [0, 0]) for _ in range(3)]
+    grid.load_bobs(bobs, [(5, 5), (6, 6), (5, 5)], [2, 1, 0])
+    assert list(grid.registry) == bobs
+    assert grid.bobs_in_case((5, 5)) == [bobs[2], bobs[0]]
+    grid.load_foods([(7, 7)], [12.5])
+    grid.check_index()
+
+def test_check_index_detects_divergence(small_config):
+    grid = Grid(small_config())
+    bob = grid.create_bob((1, 1))
+    grid.positions[bob] = (2, 2)
+    try:
+        grid.check_index()
+    except AssertionError:
+        return
+    raise AssertionError("index incohérent non détecté")
+
+def test_invariants_hold_over_days(small_config):
+    game = Game(small_config(), seed=4)
+    game.grid.check_consistency = True
+    game.grid.check_index()
+    for _ in range(5):
+        game.day_play()
+    game.grid.check_index()
+    assert game.count_bobs() == sum(len(bobs) for bobs in game.grid.bobs.values())
+
+def test_tick_skips_newborns_and_destroyed_bobs(small_config):
+    grid = Grid(small_config())
+    first, second, third = grid.create_bob((1, 1)), grid.create_bob((2, 2)), grid.create_bob((3, 3))
+    child = Bob(config=grid.config)
+    seen = []
+    for bob in grid.iter_bobs_tick():
+        seen.append(bob)
+        if bob is first:
+            # pendant le tick : une naissance et la mort d'un bob qui n'a pas encore joué
+            grid.place_child(child, (1, 1))
+            grid.destroy_object(third)
+    assert seen == [first, second]
+    assert child in grid.registry
+    # l'enfant joue au tick suivant
+    assert list(grid.iter_bobs_tick()) == [first, second, child]
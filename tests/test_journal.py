@@ -0,0 +1,38 @@
+from logic.game import Game
+from logic.journal import EventJournal, Replay
+from config import *
+
+def snapshot_state(snapshot) -> tuple:
+    return (snapshot.get_bobs_pos().tolist(), snapshot.get_bobs_last_move().tolist(),
+            snapshot.get_bobs_energy().tolist(), sorted(map(tuple, snapshot.get_foods_pos().tolist())))
+
+def recorded_game(config, directory, days=12, keyframe_days=5):
+    """ Partie jouée avec un journal, et l'instantané de chaque jour (jour -> état)
+    """
+    game = Game(config, seed=5)
+    journal = EventJournal(str(directory), keyframe_days)
+    journal.start(game)
+    states = {game.day: snapshot_state(game.render_snapshot())}
+    for _ in range(days):
+        game.day_play()
+        states[game.day] = snapshot_state(game.render_snapshot())
+    journal.close()
+    return states
+
+def test_seek_to_keyframe_matches_game(small_config, tmp_path):
+    states = recorded_game(small_config(), tmp_path)
+    replay = Replay(str(tmp_path))
+    assert replay.keyframes[:, 0].tolist() == [0, 5, 10]
+    for day in (0, 5, 10):
+        replay.seek(day)
+        assert replay.day == day
+        assert snapshot_state(replay.render_snapshot()) == states[day]
+
+def test_seek_between_keyframes_and_step(small_config, tmp_path):
+    states = recorded_game(small_config(), tmp_path)
+    replay = Replay(str(tmp_path))
+    replay.seek(7)
+    assert snapshot_state(replay.render_snapshot()) == states[7]
+    while replay.next_day():
+        assert snapshot_state(replay.render_snapshot()) == states[replay.day]
+    assert replay.day == replay.last_day() == 12
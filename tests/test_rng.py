@@ -0,0 +1,17 @@
+from logic.rng import BatchedRandom
+
+def draws(rng, n=50):
+    return [(rng.random(), rng.randint(0, 9), rng.uniform(-1, 1), rng.choice((1, -1))) for _ in range(n)]
+
+def test_same_seed_same_draws():
+    assert draws(BatchedRandom(7)) == draws(BatchedRandom(7))
+
+def test_state_round_trip_inside_a_block():
+    rng = BatchedRandom(3, block_size=16)
+    draws(rng, 5)
+    state = rng.get_state()
+    expected = draws(rng)
+
+    restored = BatchedRandom(0, block_size=16)
+    restored.set_state(state)
+    assert draws(restored) == expected
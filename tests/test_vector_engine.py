@@ -0,0 +1,27 @@
+import numpy as np
+from logic.bob import Bob
+from logic.vector_engine import VectorGame
+
+def test_attack_targets_first_light_enough_bob():
+    game = VectorGame(seed=0, populate=False)
+    game.x, game.y = np.array([1, 1, 1, 1, 2]), np.array([1, 1, 1, 1, 2])
+    game.E = np.array([100., 50., 60., 100., 10.])
+    game.mass = np.array([2., 1., 1., 2., 0.5])
+    alive = np.ones(5, dtype=bool)
+    game.attack(np.array([0, 3, 4]), alive)
+    # 0 tue 1 (premier assez léger de la case), 3 passe à 2 déjà pris par 0, 4 est seul dans sa case
+    assert alive.tolist() == [True, False, False, True, True]
+    assert game.E[0] == 100 + 0.5 * 50 * (1 - 50 / 100)
+    assert game.metrics.deaths["attack"] == 2
+
+def test_only_bobs_exactly_at_Emax_reproduce():
+    game = VectorGame(seed=0, populate=False)
+    n = 3
+    game.x, game.y = np.array([5, 10, 15]), np.array([5, 10, 15])
+    game.E = np.array([Bob.get_Emax(), Bob.get_Emax() + 10, 50.])
+    for name in ("speed", "mass", "memory", "perception"):
+        setattr(game, name, np.ones(n))
+    game.speed_buff, game.last_move = np.zeros(n), np.zeros((n, 2), dtype=np.int64)
+    game.bobs_play_tick()
+    assert game.metrics.births == 1
+    assert game.count_bobs() + sum(game.metrics.deaths.values()) == n + 1